@@ -0,0 +1,81 @@
+import pygame as py
+from config import CONSTANTS
+
+
+class AssetManager:
+    _instance = None
+
+    def __init__(self):
+        # общий кэш картинок: (путь, размер, преобразование) -> готовая поверхность
+        self.surfaces = {}
+        self.frames = {}
+        self.rotations = {}
+        self.rotation_step = CONSTANTS.get("rotation_step", 5)
+        self.memory_bytes = 0
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = AssetManager()
+        return cls._instance
+
+    def get_image(self, path, size=None, transform="scale"):
+        key = (path, tuple(size) if size else None, transform if size else None)
+        if key not in self.surfaces:
+            if size is None:
+                image = py.image.load(path).convert_alpha()
+            elif transform == "smoothscale":
+                image = py.transform.smoothscale(self.get_image(path), size)
+            else:
+                image = py.transform.scale(self.get_image(path), size)
+            self.surfaces[key] = image
+            self.memory_bytes += self.surface_bytes(image)
+        return self.surfaces[key]
+
+    def get_frames(self, path, frame_width, frame_height, scale=1):
+        key = (path, (frame_width, frame_height), scale)
+        if key not in self.frames:
+            sheet = self.get_image(path)
+            frames = []
+            for i in range(sheet.get_width() // frame_width):
+                frame = sheet.subsurface(py.Rect(i * frame_width, 0, frame_width, frame_height))
+                if scale != 1:
+                    frame = py.transform.scale(frame, (int(frame_width * scale), int(frame_height * scale)))
+                    self.memory_bytes += self.surface_bytes(frame)
+                frames.append(frame)
+            self.frames[key] = frames
+        return self.frames[key]
+
+    def get_blank(self, size):
+        key = (None, tuple(size), "blank")
+        if key not in self.surfaces:
+            image = py.Surface(size, py.SRCALPHA)
+            image.fill((0, 0, 0, 0))
+            self.surfaces[key] = image
+            self.memory_bytes += self.surface_bytes(image)
+        return self.surfaces[key]
+
+    def get_rotated(self, image, angle, step=None):
+        # угол округляется до шага атласа, каждый поворот считается один раз
+        step = step or self.rotation_step
+        quantized = round(angle / step) * step % 360
+        key = (image, quantized)
+        if key not in self.rotations:
+            rotated = py.transform.rotate(image, quantized)
+            self.rotations[key] = rotated
+            self.memory_bytes += self.surface_bytes(rotated)
+        return self.rotations[key]
+
+    @staticmethod
+    def surface_bytes(surface):
+        w, h = surface.get_size()
+        return w * h * surface.get_bytesize()
+
+    def memory_usage(self):
+        return self.memory_bytes
+
+    def clear(self):
+        self.surfaces.clear()
+        self.frames.clear()
+        self.rotations.clear()
+        self.memory_bytes = 0
@@ -1,13 +1,33 @@
 import pygame as py
 import random
 import os
+import logging
+import math
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from config import CONSTANTS
+
+logger = logging.getLogger(__name__)
+
+# каналы 0 и 1 под музыку: пока один затихает, второй набирает громкость
+MUSIC_CHANNELS = 2
+SOUND_CONFIG = CONSTANTS["sounds"]
+
+
+def emit_sound(name, pos=None):
+    # игровой код зовёт звуки всегда; пока AudioManager не создан (headless, сервер), они молчат
+    if AudioManager._instance is not None:
+        AudioManager._instance.play_sound(name, pos)
+
 
 class AudioManager:
     _instance = None
 
-    def __init__(self):
+    def __init__(self, crossfade_ms=1500, max_cached_tracks=2):
         py.mixer.init()
-        py.mixer.music.set_volume(0.1)
+        py.mixer.set_reserved(MUSIC_CHANNELS)
+        self.music_volume = 0.1
+        self.crossfade_ms = crossfade_ms
         self.current_track = None
         self.base_path = os.path.join("assets", "audio")
         self.tracks = {
@@ -20,6 +40,28 @@ class AudioManager:
             ]
         }
 
+        # трек декодируется в фоновом потоке, главный поток только забирает готовый звук
+        self.loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="music-loader")
+        self.loaded = OrderedDict()
+        self.max_cached_tracks = max_cached_tracks
+        self.pending = None
+        self.channels = [py.mixer.Channel(i) for i in range(MUSIC_CHANNELS)]
+        self.active = None
+        self.fade_start = None
+
+        # эффекты декодируются один раз и играют через фиксированный пул каналов
+        sfx_count = SOUND_CONFIG.get("channels", 16)
+        py.mixer.set_num_channels(MUSIC_CHANNELS + sfx_count)
+        self.sfx_channels = [py.mixer.Channel(MUSIC_CHANNELS + i) for i in range(sfx_count)]
+        # что играет в канале пула: (имя, приоритет, время запуска)
+        self.voices = [None] * sfx_count
+        self.hearing_radius = SOUND_CONFIG.get("hearing_radius", 1200)
+        # игроки по половинам экрана: первый слева, второй справа
+        self.listeners = []
+        self.effects = SOUND_CONFIG["effects"]
+        self.sounds = {}
+        self.load_sounds()
+
     @classmethod
     def get_instance(cls):
         if cls._instance is None:
@@ -29,24 +71,147 @@ class AudioManager:
     def play_music(self, track, loop=-1):
         if self.current_track == track:
             return
-        self.stop_music()
+        self.current_track = track
+        self.pending = None
 
         if not os.path.exists(track):
-            raise FileNotFoundError(f"ФАЙЛА НЕТ ДУРА: {track}")
+            logger.warning("music file not found: %s", track)
+            self.fadeout_channels(self.crossfade_ms)
+            return
 
-        py.mixer.music.load(track)
-        py.mixer.music.play(loop)
-        self.current_track = track
+        sound = self.loaded.get(track)
+        if sound is None:
+            self.pending = (track, loop, self.loader.submit(py.mixer.Sound, track))
+        else:
+            self.loaded.move_to_end(track)
+            self.start_crossfade(sound, loop)
+
+    def load_sounds(self):
+        for name, effect in self.effects.items():
+            path = effect["file"]
+            if not os.path.exists(path):
+                logger.warning("sound file not found: %s", path)
+                continue
+            try:
+                sound = py.mixer.Sound(path)
+            except py.error as error:
+                logger.warning("could not load sound %s: %s", path, error)
+                continue
+            sound.set_volume(effect.get("volume", 1.0))
+            self.sounds[name] = sound
+
+    def play_sound(self, name, pos=None):
+        sound = self.sounds.get(name)
+        if sound is None:
+            return None
+        left, right = self.pan(pos)
+        if left <= 0 and right <= 0:
+            return None
+
+        slot = self.find_slot(name)
+        if slot is None:
+            return None
+        channel = self.sfx_channels[slot]
+        channel.play(sound)
+        channel.set_volume(left, right)
+        self.voices[slot] = (name, self.effects[name].get("priority", 0), py.time.get_ticks())
+        return channel
+
+    def find_slot(self, name):
+        effect = self.effects[name]
+        playing = [i for i, channel in enumerate(self.sfx_channels) if channel.get_busy()]
+
+        # лимит голосов: новый звук занимает место самого старого такого же
+        same = [i for i in playing if self.voices[i][0] == name]
+        if len(same) >= effect.get("voices", 1):
+            return min(same, key=lambda i: self.voices[i][2])
+
+        if len(playing) < len(self.sfx_channels):
+            busy = set(playing)
+            return next(i for i in range(len(self.sfx_channels)) if i not in busy)
+
+        # пул занят: вытесняем самый старый из наименее важных, если он не важнее нового
+        victim = min(playing, key=lambda i: self.voices[i][1:])
+        if self.voices[victim][1] <= effect.get("priority", 0):
+            return victim
+        return None
+
+    def pan(self, pos):
+        if pos is None or not self.listeners:
+            return 1.0, 1.0
+        distances = [math.hypot(pos[0] - p.rect.centerx, pos[1] - p.rect.centery) for p in self.listeners]
+        gain = 1 - min(distances) / self.hearing_radius
+        if gain <= 0:
+            return 0.0, 0.0
+        if len(distances) < 2:
+            return gain, gain
+
+        # равная мощность: звук смещается к половине экрана того игрока, кто ближе
+        total = distances[0] + distances[1]
+        right_share = distances[0] / total if total else 0.5
+        angle = right_share * math.pi / 2
+        return gain * math.cos(angle), gain * math.sin(angle)
 
     def play_random_level_music(self):
         track = random.choice(self.tracks["level"])
         self.play_music(track)
         return track
 
+    def update(self):
+        # раз в кадр: подхватить догрузившийся трек и продвинуть кроссфейд
+        if self.pending is not None and self.pending[2].done():
+            track, loop, future = self.pending
+            self.pending = None
+            try:
+                sound = future.result()
+            except Exception as error:
+                logger.warning("could not load music %s: %s", track, error)
+                self.fadeout_channels(self.crossfade_ms)
+                return
+            self.loaded[track] = sound
+            if len(self.loaded) > self.max_cached_tracks:
+                self.loaded.popitem(last=False)
+            self.start_crossfade(sound, loop)
+
+        if self.fade_start is None:
+            return
+        progress = min(1.0, (py.time.get_ticks() - self.fade_start) / self.crossfade_ms)
+        for channel in self.channels:
+            if channel is self.active:
+                channel.set_volume(self.music_volume * progress)
+            elif channel.get_busy():
+                channel.set_volume(min(channel.get_volume(), self.music_volume * (1 - progress)))
+        if progress >= 1.0:
+            for channel in self.channels:
+                if channel is not self.active:
+                    channel.stop()
+            self.fade_start = None
+
+    def start_crossfade(self, sound, loop):
+        # новый трек идёт в свободный канал с нулевой громкостью, старый затихает в update
+        channel = self.channels[1] if self.active is self.channels[0] else self.channels[0]
+        channel.stop()
+        channel.set_volume(0)
+        channel.play(sound, loops=loop)
+        self.active = channel
+        self.fade_start = py.time.get_ticks()
+
+    def fadeout_channels(self, duration_ms):
+        for channel in self.channels:
+            if channel.get_busy():
+                channel.fadeout(duration_ms)
+        self.active = None
+        self.fade_start = None
+
     def stop_music(self):
-        py.mixer.music.stop()
+        for channel in self.channels:
+            channel.stop()
+        self.active = None
+        self.fade_start = None
+        self.pending = None
         self.current_track = None
 
     def fadeout_music(self, duration_ms):
-        py.mixer.music.fadeout(duration_ms)
+        self.fadeout_channels(duration_ms)
+        self.pending = None
         self.current_track = None
@@ -0,0 +1,36 @@
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame as py
+
+from config import LEVELS_DIR, load_json
+from sprites.map import Map
+from sprites.enemies import EnemySwarm
+from sprites.level_bundle import compile_level
+
+
+def main():
+    # python compile_levels.py [level_id ...] - без аргументов собираются все уровни
+    py.init()
+    py.display.set_mode((1, 1))
+
+    # враги встают на те же кандидаты, что посчитаны здесь: размер берётся из их спрайта
+    enemy_size = EnemySwarm().rect_at((0, 0)).size
+
+    level_ids = sys.argv[1:] or [f[:-len(".json")] for f in os.listdir(LEVELS_DIR) if f.endswith(".json")]
+    for level_id in level_ids:
+        start = time.perf_counter()
+        level_file = os.path.join(LEVELS_DIR, f"{level_id}.json")
+        level_data = load_json(level_file)
+        game_map = Map(level_data["map"], level_data.get("background_color", (40, 40, 40)), render=False)
+        path = compile_level(level_file, level_data["map"], game_map, [enemy_size])
+        print(f"{level_id}: {path} ({os.path.getsize(path) // 1024} КБ, {time.perf_counter() - start:.2f} с)")
+
+    py.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import pygame as py
+from collections import OrderedDict
+
+
+class FontManager:
+    _instance = None
+
+    def __init__(self, max_cached_texts=512):
+        self.fonts = {}
+        # LRU отрисованных строк: (шрифт, размер, жирный, текст, цвет) -> поверхность
+        self.texts = OrderedDict()
+        self.max_cached_texts = max_cached_texts
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = FontManager()
+        return cls._instance
+
+    def get_font(self, name=None, size=20, bold=False):
+        key = (name, size, bold)
+        if key not in self.fonts:
+            self.fonts[key] = py.font.SysFont(name, size, bold=bold)
+        return self.fonts[key]
+
+    def render(self, text, size=20, color=(255, 255, 255), name=None, bold=False):
+        key = (name, size, bold, text, tuple(color))
+        surface = self.texts.get(key)
+        if surface is not None:
+            self.texts.move_to_end(key)
+            return surface
+
+        surface = self.get_font(name, size, bold).render(text, True, color)
+        self.texts[key] = surface
+        if len(self.texts) > self.max_cached_texts:
+            self.texts.popitem(last=False)
+        return surface
+
+    def layout_runs(self, pos, parts, size=20, color=(255, 255, 255), name=None, bold=False):
+        # строка собирается из кусков: меняющиеся числа рисуются по цифрам из кэша
+        x, y = pos
+        blits = []
+        for part in parts:
+            run = self.render(part, size, color, name, bold)
+            blits.append((run, (x, y)))
+            x += run.get_width()
+        return blits
+
+    def layout_number(self, pos, prefix, number, size=20, color=(255, 255, 255), name=None, bold=False):
+        return self.layout_runs(pos, [prefix, *str(number)], size, color, name, bold)
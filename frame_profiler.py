@@ -0,0 +1,143 @@
+import csv
+import time
+from collections import deque
+
+import numpy as np
+import pygame as py
+
+from font_manager import FontManager
+
+
+class PhaseTimer:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+class NullPhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_PHASE = NullPhase()
+
+
+class FrameProfiler:
+    _instance = None
+
+    def __init__(self, history_frames=3600, window_frames=300, stats_interval=30):
+        # время фаз кадра в мс; история ограничена, перцентили считаются по последнему окну.
+        # замеры идут, только пока открыт оверлей или включена запись (enable)
+        self.enabled = False
+        self.recording = False
+        self.csv_path = None
+        self.overlay_visible = False
+        self.history = deque(maxlen=history_frames)
+        self.window_frames = window_frames
+        self.stats_interval = stats_interval
+        self.phase_names = []
+        self.current = {}
+        self.last_frame_end = None
+        self.frames_since_stats = 0
+        self.overlay_lines = []
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = FrameProfiler()
+        return cls._instance
+
+    def enable(self, csv_path=None):
+        # постоянная запись: headless, сервер, запуск игры с --profile (тогда csv_path задан)
+        self.recording = True
+        self.csv_path = csv_path or self.csv_path
+        self.enabled = True
+
+    def phase(self, name):
+        if not self.enabled:
+            return NULL_PHASE
+        return PhaseTimer(self, name)
+
+    def add(self, name, ms):
+        if name not in self.current:
+            self.current[name] = 0.0
+            if name not in self.phase_names:
+                self.phase_names.append(name)
+        self.current[name] += ms
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.last_frame_end is not None:
+            self.add("total", (now - self.last_frame_end) * 1000)
+        self.last_frame_end = now
+        self.history.append(self.current)
+        self.current = {}
+
+        # перцентили пересчитываются раз в stats_interval кадров и только для оверлея
+        self.frames_since_stats += 1
+        if self.overlay_visible and self.frames_since_stats >= self.stats_interval:
+            self.frames_since_stats = 0
+            self.overlay_lines = self.format_stats(self.percentiles())
+
+    def percentiles(self, frames=None):
+        frames = list(self.history)[-(frames or self.window_frames):]
+        stats = {}
+        for name in self.phase_names:
+            values = np.array([frame.get(name, 0.0) for frame in frames])
+            if values.size:
+                stats[name] = np.percentile(values, (50, 95, 99))
+        return stats
+
+    @staticmethod
+    def format_stats(stats):
+        lines = [f"{'фаза':<22}{'p50':>8}{'p95':>8}{'p99':>8}"]
+        for name, (p50, p95, p99) in stats.items():
+            lines.append(f"{name:<22}{p50:8.2f}{p95:8.2f}{p99:8.2f}")
+        return lines
+
+    def toggle_overlay(self):
+        self.overlay_visible = not self.overlay_visible
+        self.frames_since_stats = self.stats_interval
+        if not self.recording:
+            self.enabled = self.overlay_visible
+            # первый кадр после включения не должен включать время, пока замеров не было
+            self.last_frame_end = None
+
+    def draw_overlay(self, surface):
+        if not self.overlay_visible or not self.overlay_lines:
+            return
+        fonts = FontManager.get_instance()
+        lines = [fonts.render(line, 16, (0, 255, 0), name="monospace") for line in self.overlay_lines]
+        width = max(line.get_width() for line in lines) + 10
+        height = sum(line.get_height() for line in lines) + 10
+
+        background = py.Surface((width, height), py.SRCALPHA)
+        background.fill((0, 0, 0, 170))
+        surface.blit(background, (0, 0))
+        y = 5
+        for line in lines:
+            surface.blit(line, (5, y))
+            y += line.get_height()
+
+    def dump_csv(self, path=None):
+        path = path or self.csv_path
+        if not path or not self.history:
+            return
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame"] + self.phase_names)
+            for index, frame in enumerate(self.history):
+                writer.writerow([index] + [f"{frame.get(name, 0.0):.3f}" for name in self.phase_names])
@@ -0,0 +1,28 @@
+import pygame as py
+
+
+class GameClock:
+    _instance = None
+
+    def __init__(self):
+        # в обычной игре время берётся у pygame, в headless-режиме идёт по шагам симуляции
+        self.virtual = False
+        self.virtual_ms = 0
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = GameClock()
+        return cls._instance
+
+    def get_ticks(self):
+        if self.virtual:
+            return int(self.virtual_ms)
+        return py.time.get_ticks()
+
+    def use_virtual(self, start_ms=0):
+        self.virtual = True
+        self.virtual_ms = start_ms
+
+    def advance(self, ms):
+        self.virtual_ms += ms
@@ -0,0 +1,98 @@
+import os
+import sys
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame as py
+
+from config import CONSTANTS
+from game_clock import GameClock
+from frame_profiler import FrameProfiler
+
+MOVE_KEYS = [py.K_w, py.K_a, py.K_s, py.K_d, py.K_UP, py.K_DOWN, py.K_LEFT, py.K_RIGHT]
+ACTION_KEYS = [py.K_SPACE, py.K_RETURN, py.K_q, py.K_e, py.K_KP7, py.K_KP8]
+
+
+class HeldKeys:
+    # замена py.key.get_pressed(): клавиатура одна на обоих игроков, как и в обычной игре
+    def __init__(self, keys=()):
+        self.keys = set(keys)
+
+    def __getitem__(self, key):
+        return key in self.keys
+
+
+def random_script(seed=None, hold_ticks=40, action_chance=0.1):
+    rng = random.Random(seed)
+    held = []
+
+    def script(tick, scene):
+        if tick % hold_ticks == 0:
+            held[:] = rng.sample(MOVE_KEYS, 3)
+        tapped = [key for key in ACTION_KEYS if rng.random() < action_chance]
+        return held, tapped
+
+    return script
+
+
+def run_headless(level_id, ticks, script=None, characters=("man", "woman"), seed=None, tick_ms=None):
+    # матч без окна и звука; время идёт по виртуальным часам ровно на шаг за тик
+    py.init()
+    if py.display.get_surface() is None:
+        # convert_alpha нужна поверхность дисплея, хватит пустой 1x1
+        py.display.set_mode((1, 1))
+
+    from src.scenes.level_scene import LevelScene
+
+    if seed is not None:
+        random.seed(seed)
+    tick_ms = tick_ms or 1000 / CONSTANTS.get("TICK_RATE", CONSTANTS["FPS"])
+    clock = GameClock.get_instance()
+    clock.use_virtual()
+
+    scene = LevelScene(level_id, headless=True)
+    scene.set_player_choices(*characters)
+    keyboard = HeldKeys()
+    for player in scene.players:
+        player.input_source = lambda: keyboard
+
+    profiler = FrameProfiler.get_instance()
+    profiler.enable()
+    played = 0
+    for tick in range(ticks):
+        if script:
+            held, tapped = script(tick, scene)
+            keyboard.keys = set(held)
+            for key in tapped:
+                scene.handle_event(py.event.Event(py.KEYDOWN, key=key))
+        scene.update()
+        clock.advance(tick_ms)
+        profiler.end_frame()
+        played += 1
+        if scene.finished:
+            break
+    return scene, played
+
+
+def main():
+    level_id = sys.argv[1] if len(sys.argv) > 1 else "level1"
+    ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+
+    start = time.perf_counter()
+    scene, played = run_headless(level_id, ticks, random_script(seed), seed=seed)
+    elapsed = time.perf_counter() - start
+
+    print(f"{played} тиков за {elapsed:.2f} с ({played / elapsed:.0f} тиков/с)")
+    print(f"врагов: {len(scene.enemies)}, здоровье игроков: {[p.health for p in scene.players]}, "
+          f"победитель: {scene.winner_index}")
+    print(f"ИИ по уровням: {scene.ai_scheduler.counts}")
+    for line in FrameProfiler.format_stats(FrameProfiler.get_instance().percentiles(played)):
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,43 @@
+from startup_timer import StartupTimer
+StartupTimer.get_instance()  # отсчёт холодного старта идёт отсюда
+
 import pygame as py
 import sys
 import os
 
 from scene_manager import SceneManager
-from src.scenes import character_select
-from src.scenes.level_scene import LevelScene
 from config import CONSTANTS, LEVELS_DIR
+from frame_profiler import FrameProfiler
+from audio_manager import AudioManager
 from src.scenes.menu import MainMenuScene
-from src.scenes.introduction import IntroductionScene
-from src.scenes.controls_guide import ControlsInfoScene
+
+
+def make_introduction():
+    from src.scenes.introduction import IntroductionScene
+    return IntroductionScene(next_scene="controls_guide")
+
+
+def make_controls_guide():
+    from src.scenes.controls_guide import ControlsInfoScene
+    return ControlsInfoScene(next_scene="character_select")
+
+
+def make_character_select():
+    from src.scenes.character_select import CharacterSelect
+    return CharacterSelect(default_next="level1")
+
+
+def make_level(level_id):
+    from src.scenes.level_scene import LevelScene
+    scene = LevelScene(level_id)
+    StartupTimer.get_instance().mark("level ready")
+    return scene
 
 
 def main():
+    startup = StartupTimer.get_instance()
+    startup.mark("import")
+
     py.init()
     screen_config = CONSTANTS["screen"]
     screen_size = (screen_config["width"], screen_config["height"])
@@ -21,41 +47,67 @@ def main():
 
     scene_manager = SceneManager.get_instance()
 
+    # сразу строится только меню, остальные сцены - при первом входе
     scene_manager.add("main_menu", MainMenuScene(next_scene="introduction"))
-    scene_manager.add("introduction", IntroductionScene(next_scene="controls_guide"))
-    scene_manager.add("controls_guide", ControlsInfoScene(next_scene="character_select"))
-    scene_manager.add("character_select", character_select.CharacterSelect(default_next="level1"))
+    scene_manager.register("introduction", make_introduction)
+    scene_manager.register("controls_guide", make_controls_guide)
+    scene_manager.register("character_select", make_character_select)
 
+    # уровни собираются при первом входе; первый уровень начинает грузиться после первого кадра меню
     for file in os.listdir(LEVELS_DIR):
         if file.endswith(".json"):
             level_id = file.replace(".json", "")
-            scene = LevelScene(level_id)
-            scene_manager.add(level_id, scene)
-
+            scene_manager.register(level_id, lambda level_id=level_id: make_level(level_id))
 
     scene_manager.set_scene("main_menu")
+    startup.mark("init")
+
+    # F3 - таблица времени фаз кадра; с --profile замеры идут всегда и при выходе пишутся в frame_times.csv
+    profiler = FrameProfiler.get_instance()
+    if "--profile" in sys.argv:
+        profiler.enable("frame_times.csv")
 
     running = True
+    last_time = py.time.get_ticks()
     while running:
-        for event in py.event.get():
-            if event.type == py.QUIT:
-                running = False
-            elif event.type == py.VIDEORESIZE:
-                screen_size = event.size
-                screen = py.display.set_mode(screen_size, py.RESIZABLE)
+        with profiler.phase("events"):
+            for event in py.event.get():
+                if event.type == py.QUIT:
+                    running = False
+                elif event.type == py.VIDEORESIZE:
+                    screen_size = event.size
+                    screen = py.display.set_mode(screen_size, py.RESIZABLE)
+                elif event.type == py.KEYDOWN and event.key == py.K_F3:
+                    profiler.toggle_overlay()
 
-            scene_manager.handle_event(event)
+                scene_manager.handle_event(event)
 
-        scene_manager.update()
-        if hasattr(scene_manager.current_scene, 'update_layout'):
-            scene_manager.current_scene.update_layout(screen_size)
+        with profiler.phase("update"):
+            now = py.time.get_ticks()
+            scene_manager.advance(now - last_time)
+            last_time = now
+            AudioManager.get_instance().update()
+            if hasattr(scene_manager.current_scene, 'update_layout'):
+                scene_manager.current_scene.update_layout(screen_size)
 
-        scene_manager.render(screen)
-        py.display.flip()
-        clock.tick(CONSTANTS["FPS"])
+        with profiler.phase("render"):
+            scene_manager.render(screen)
+            profiler.draw_overlay(screen)
+        with profiler.phase("flip"):
+            py.display.flip()
+        if not startup.has("first frame"):
+            startup.mark("first frame")
+            scene_manager.preload("level1")
+        elif not startup.reported and startup.has("level ready"):
+            for line in startup.report():
+                print(line)
+        with profiler.phase("tick"):
+            clock.tick(CONSTANTS["FPS"])
+        profiler.end_frame()
 
+    profiler.dump_csv()
     py.quit()
     sys.exit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
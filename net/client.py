@@ -0,0 +1,96 @@
+import asyncio
+import random
+import struct
+import sys
+import time
+
+from net import protocol
+from net.snapshot import apply_delta
+
+HISTORY_SIZE = 64
+
+
+class MatchClient:
+    # держит восстановленные снимки: дельта всегда считается от того, что клиент подтвердил
+    def __init__(self):
+        self.slot = None
+        self.level_id = None
+        self.snapshots = {}
+        self.latest_id = 0
+        self.tick = 0
+        self.snapshots_received = 0
+        self.bytes_received = 0
+        self.reader = None
+        self.writer = None
+
+    @property
+    def state(self):
+        return self.snapshots.get(self.latest_id)
+
+    async def connect(self, host="127.0.0.1", port=50007):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        message_type, body = await protocol.read_frame(self.reader)
+        if message_type != protocol.WELCOME:
+            raise ConnectionError("сервер не принял игрока")
+        self.slot = body[0]
+        self.level_id = body[1:].decode("utf-8")
+
+    async def receive(self):
+        while True:
+            message_type, body = await protocol.read_frame(self.reader)
+            self.bytes_received += len(body) + protocol.HEADER.size
+            if message_type != protocol.SNAPSHOT:
+                continue
+            try:
+                snapshot_id, base_id = protocol.SNAPSHOT_FORMAT.unpack_from(body)
+            except struct.error:
+                self.writer.close()
+                raise ConnectionError("битый снимок от сервера")
+            if base_id and base_id not in self.snapshots:
+                # базы уже нет: снимок пропускаем, сервер увидит старое подтверждение и пришлёт от него
+                continue
+            self.snapshots[snapshot_id] = apply_delta(self.snapshots.get(base_id), body[protocol.SNAPSHOT_FORMAT.size:])
+            # сервер может пропускать номера, поэтому чистим всё старше окна, а не один id
+            for old_id in [i for i in self.snapshots if i <= snapshot_id - HISTORY_SIZE]:
+                del self.snapshots[old_id]
+            self.latest_id = snapshot_id
+            self.snapshots_received += 1
+
+    def send_input(self, move_bits, action_bits):
+        self.tick += 1
+        body = protocol.INPUT_FORMAT.pack(self.tick, self.latest_id, move_bits, action_bits)
+        self.writer.write(protocol.frame(protocol.INPUT, body))
+
+
+async def run_bot(host, port, seconds, tick_rate=60):
+    # бот для нагрузочных прогонов: случайное движение и атаки, в конце - принятый трафик
+    client = MatchClient()
+    await client.connect(host, port)
+    receiver = asyncio.create_task(client.receive())
+    move = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        if client.tick % 40 == 0:
+            move = random.choice([protocol.MOVE_UP, protocol.MOVE_DOWN]) | random.choice([protocol.MOVE_LEFT, protocol.MOVE_RIGHT])
+        client.send_input(move, protocol.ACTION_ATTACK if random.random() < 0.1 else 0)
+        await asyncio.sleep(1 / tick_rate)
+    receiver.cancel()
+    client.writer.close()
+
+    state = client.state
+    counts = {name: len(records) for name, records in state.items()} if state else {}
+    received = max(client.snapshots_received, 1)
+    print(f"игрок {client.slot + 1}: снимков {client.snapshots_received}, "
+          f"{client.bytes_received / received:.0f} Б/снимок, {counts}")
+
+
+def main():
+    # python -m net.client [host] [port] [секунд]
+    host = sys.argv[1] if len(sys.argv) > 1 else "127.0.0.1"
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 50007
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 10
+    asyncio.run(run_bot(host, port, seconds))
+
+
+if __name__ == "__main__":
+    main()
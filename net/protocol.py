@@ -0,0 +1,37 @@
+import struct
+
+import pygame as py
+
+# кадр: длина (u32) + тип сообщения (u8) + тело
+HEADER = struct.Struct("<IB")
+
+INPUT = 0x02
+WELCOME = 0x81
+SNAPSHOT = 0x82
+
+INPUT_FORMAT = struct.Struct("<IIBB")  # тик клиента, последний принятый снимок, движение, действия
+SNAPSHOT_FORMAT = struct.Struct("<II")  # номер снимка, номер базового (0 - полный)
+
+MOVE_UP, MOVE_DOWN, MOVE_LEFT, MOVE_RIGHT = 1, 2, 4, 8
+ACTION_ATTACK, ACTION_PREV, ACTION_NEXT, ACTION_DROP = 1, 2, 4, 8
+
+# раскладки те же, что в LevelScene.handle_event: слот 0 - wasd, слот 1 - стрелки
+KEYMAPS = [
+    {"move": (py.K_w, py.K_s, py.K_a, py.K_d), "actions": (py.K_SPACE, py.K_q, py.K_e, py.K_r)},
+    {"move": (py.K_UP, py.K_DOWN, py.K_LEFT, py.K_RIGHT), "actions": (py.K_RETURN, py.K_KP7, py.K_KP8, py.K_RCTRL)},
+]
+
+
+def frame(message_type, body=b""):
+    return HEADER.pack(len(body) + 1, message_type) + body
+
+
+async def read_frame(reader):
+    length, message_type = HEADER.unpack(await reader.readexactly(HEADER.size))
+    body = await reader.readexactly(length - 1) if length > 1 else b""
+    return message_type, body
+
+
+def bits_to_keys(bits, keys):
+    return {key for i, key in enumerate(keys) if bits & (1 << i)}
+
@@ -0,0 +1,177 @@
+import asyncio
+import struct
+import sys
+import time
+from collections import deque
+
+import pygame as py
+
+from config import CONSTANTS
+from game_clock import GameClock
+from frame_profiler import FrameProfiler
+from headless import HeldKeys
+from net import protocol
+from net.snapshot import capture, encode_delta
+
+HISTORY_SIZE = 64
+REPORT_EVERY_TICKS = 300
+# пока в сокете клиента больше SEND_BUFFER_LIMIT неотправленных байт, снимки ему пропускаются
+# (следующая дельта всё равно строится от подтверждённого); застрявший дольше STALL_DROP_TICKS отключается
+SEND_BUFFER_LIMIT = 64 * 1024
+STALL_DROP_TICKS = 300
+
+
+class ClientState:
+    def __init__(self, slot, writer):
+        self.slot = slot
+        self.writer = writer
+        self.keyboard = HeldKeys()
+        self.actions = []
+        self.acked = 0
+        self.dropped = False
+        self.stalled_ticks = 0
+        self.bytes_sent = deque(maxlen=REPORT_EVERY_TICKS)
+
+
+class MatchServer:
+    # авторитетный сервер: LevelScene крутится здесь, клиенты шлют ввод и получают дельты снимков
+    def __init__(self, level_id, extra_enemies=0):
+        py.init()
+        if py.display.get_surface() is None:
+            py.display.set_mode((1, 1))
+        from src.scenes.level_scene import LevelScene
+
+        self.clock = GameClock.get_instance()
+        self.clock.use_virtual()
+        self.tick_ms = 1000 / CONSTANTS.get("TICK_RATE", CONSTANTS["FPS"])
+        self.level_id = level_id
+        self.extra_enemies = extra_enemies
+        self.scene = LevelScene(level_id, headless=True)
+        self.scene.set_player_choices("man", "woman")
+        self.add_enemies(extra_enemies)
+
+        self.clients = {}
+        self.history = {}
+        self.snapshot_id = 0
+        self.profiler = FrameProfiler.get_instance()
+        self.profiler.enable()
+
+    def add_enemies(self, count):
+        # дополнительные враги для нагрузочных прогонов, в случайных свободных местах
+        scene = self.scene
+        for _ in range(count * 10):
+            if count <= 0:
+                break
+            point = scene.map.random_spawn_point()
+            if point is None:
+                break
+            center = (point[0] + 16, point[1] + 16)
+            if scene.map.is_rect_walkable(scene.enemies.rect_at(center)):
+                scene.add_enemy(center)
+                count -= 1
+
+    def bind_inputs(self):
+        for slot, player in enumerate(self.scene.players):
+            client = self.clients.get(slot)
+            keyboard = client.keyboard if client else HeldKeys()
+            player.input_source = lambda keyboard=keyboard: keyboard
+
+    async def handle_client(self, reader, writer):
+        slot = next((i for i in range(2) if i not in self.clients), None)
+        if slot is None:
+            writer.close()
+            return
+        client = self.clients[slot] = ClientState(slot, writer)
+        self.bind_inputs()
+        writer.write(protocol.frame(protocol.WELCOME, bytes([slot]) + self.level_id.encode("utf-8")))
+        try:
+            while True:
+                message_type, body = await protocol.read_frame(reader)
+                if message_type == protocol.INPUT:
+                    _, acked, move, actions = protocol.INPUT_FORMAT.unpack(body)
+                    keymap = protocol.KEYMAPS[slot]
+                    client.keyboard.keys = protocol.bits_to_keys(move, keymap["move"])
+                    client.actions += protocol.bits_to_keys(actions, keymap["actions"])
+                    client.acked = acked
+        except (asyncio.IncompleteReadError, ConnectionError, struct.error):
+            # битое тело INPUT - такой клиент отключается так же, как оборвавший связь
+            pass
+        finally:
+            del self.clients[slot]
+            self.bind_inputs()
+            writer.close()
+
+    def step(self):
+        scene = self.scene
+        with self.profiler.phase("net.update"):
+            for client in self.clients.values():
+                for key in client.actions:
+                    scene.handle_event(py.event.Event(py.KEYDOWN, key=key))
+                client.actions.clear()
+            scene.update()
+            self.clock.advance(self.tick_ms)
+            if scene.finished:
+                # рестарт расставляет уровень заново, нагрузочных врагов нужно вернуть
+                scene.restart_level()
+                self.add_enemies(self.extra_enemies)
+                self.bind_inputs()
+
+        with self.profiler.phase("net.encode"):
+            self.snapshot_id += 1
+            snapshot = capture(scene)
+            self.history[self.snapshot_id] = snapshot
+            self.history.pop(self.snapshot_id - HISTORY_SIZE, None)
+            for client in self.clients.values():
+                if client.dropped:
+                    continue
+                if client.writer.transport.get_write_buffer_size() > SEND_BUFFER_LIMIT:
+                    client.stalled_ticks += 1
+                    if client.stalled_ticks > STALL_DROP_TICKS:
+                        # клиент не читает: закрываем, handle_client уберёт его из списка
+                        client.dropped = True
+                        client.writer.transport.abort()
+                    continue
+                client.stalled_ticks = 0
+                # база - последний подтверждённый снимок; если он уже выпал из истории, шлём полный
+                base_id = client.acked if client.acked in self.history else 0
+                body = encode_delta(self.history.get(base_id), snapshot)
+                message = protocol.frame(protocol.SNAPSHOT, protocol.SNAPSHOT_FORMAT.pack(self.snapshot_id, base_id) + body)
+                client.writer.write(message)
+                client.bytes_sent.append(len(message))
+        self.profiler.end_frame()
+
+    def report(self):
+        stats = self.profiler.percentiles(REPORT_EVERY_TICKS)
+        tick = [stats[name][[0, 2]] for name in ("net.update", "net.encode") if name in stats]
+        line = f"тик {self.snapshot_id}: врагов {len(self.scene.enemies)} {self.scene.ai_scheduler.counts}"
+        if len(tick) == 2:
+            line += f", update p50/p99 {tick[0][0]:.2f}/{tick[0][1]:.2f} мс, encode p50/p99 {tick[1][0]:.2f}/{tick[1][1]:.2f} мс"
+        for client in self.clients.values():
+            if client.bytes_sent:
+                sent = client.bytes_sent
+                line += f", игрок {client.slot + 1}: {sum(sent) / len(sent):.0f} Б/тик (макс {max(sent)})"
+        print(line)
+
+    async def serve(self, host="127.0.0.1", port=50007):
+        server = await asyncio.start_server(self.handle_client, host, port)
+        print(f"сервер {self.level_id} на {host}:{port}")
+        next_tick = time.perf_counter()
+        async with server:
+            while True:
+                self.step()
+                if self.snapshot_id % REPORT_EVERY_TICKS == 0:
+                    self.report()
+                next_tick += self.tick_ms / 1000
+                await asyncio.sleep(max(0.0, next_tick - time.perf_counter()))
+
+
+def main():
+    # python -m net.server [level_id] [port] [дополнительные враги]
+    level_id = sys.argv[1] if len(sys.argv) > 1 else "level1"
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 50007
+    extra_enemies = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    asyncio.run(MatchServer(level_id, extra_enemies).serve(port=port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import itertools
+import struct
+
+import numpy as np
+
+from config import CONSTANTS
+
+# квантованное состояние: координаты - целые пиксели в u16, угол - 256 шагов на круг
+SCHEMA = {
+    "players": [("x", "<u2"), ("y", "<u2"), ("angle", "u1"), ("health", "<i2"), ("weapon", "u1"), ("frame", "u1")],
+    "enemies": [("x", "<u2"), ("y", "<u2"), ("health", "<i2"), ("frame", "u1"), ("facing", "u1")],
+    "projectiles": [("kind", "u1"), ("x", "<u2"), ("y", "<u2")],
+    "weapons": [("kind", "u1"), ("x", "<u2"), ("y", "<u2")],
+    "effects": [("state", "u1"), ("x", "<u2"), ("y", "<u2"), ("radius", "<u2")],
+}
+CATEGORIES = list(SCHEMA)
+DTYPES = {name: np.dtype([("id", "<u4")] + fields) for name, fields in SCHEMA.items()}
+
+WEAPON_KINDS = {name: i for i, name in enumerate(CONSTANTS["weapons"]["types"])}
+PROJECTILE_KINDS = {"Bullet": 0, "Boomerang": 1, "Yoyo": 2}
+EFFECT_STATES = {"waiting": 0, "active": 1, "finished": 2}
+NO_WEAPON = 255
+
+COUNT = struct.Struct("<I")
+net_ids = itertools.count(1)
+
+
+def net_id(obj):
+    # пули из пула и оружие не живут в реестре; им id выдаётся при первой съёмке
+    if getattr(obj, "net_id", None) is None:
+        obj.net_id = next(net_ids)
+    return obj.net_id
+
+
+def coord(values):
+    return np.clip(np.rint(values), 0, 65535)
+
+
+def empty():
+    return {name: np.zeros(0, dtype=DTYPES[name]) for name in CATEGORIES}
+
+
+def records(name, rows):
+    array = np.array(rows, dtype=DTYPES[name]) if rows else np.zeros(0, dtype=DTYPES[name])
+    return np.sort(array, order="id")
+
+
+def capture(scene):
+    snapshot = {}
+
+    rows = []
+    for slot, player in enumerate(scene.players):
+        weapon = player.get_current_weapon()
+        rows.append((slot, *coord(player.rect.center), int(player.facing_angle % 360 * 256 / 360) & 255,
+                     np.clip(player.health, -32768, 32767),
+                     WEAPON_KINDS.get(weapon.weapon_type, NO_WEAPON) if weapon else NO_WEAPON,
+                     player.current_frame))
+    snapshot["players"] = records("players", rows)
+
+    # враги снимаются прямо из массивов роя
+    swarm = scene.enemies
+    enemies = np.zeros(len(swarm), dtype=DTYPES["enemies"])
+    if len(swarm):
+        enemies["id"] = [view.entity_id for view in swarm.views]
+        enemies["x"] = coord(swarm.pos[:, 0])
+        enemies["y"] = coord(swarm.pos[:, 1])
+        enemies["health"] = np.clip(swarm.health, -32768, 32767)
+        enemies["frame"] = swarm.frame
+        enemies["facing"] = swarm.facing_right
+    snapshot["enemies"] = np.sort(enemies, order="id")
+
+    snapshot["projectiles"] = records("projectiles", [
+        (net_id(obj), PROJECTILE_KINDS.get(type(obj).__name__, 0), *coord(obj.rect.center))
+        for obj in scene.bullets
+    ])
+    snapshot["weapons"] = records("weapons", [
+        (net_id(weapon), WEAPON_KINDS.get(weapon.weapon_type, NO_WEAPON), *coord(weapon.rect.center))
+        for weapon in scene.weapons
+    ])
+    snapshot["effects"] = records("effects", [
+        (entity_id, EFFECT_STATES.get(effect.state, 0), *coord(effect.position), effect.radius)
+        for entity_id, effect in scene.effects.items()
+    ])
+    return snapshot
+
+
+def encode_delta(base, current):
+    # по каждой категории: удалённые id, затем изменённые записи с маской полей
+    # и значения только изменившихся полей, сложенные по столбцам
+    base = base or empty()
+    parts = []
+    for name in CATEGORIES:
+        old, new = base[name], current[name]
+        fields = [field for field, _ in SCHEMA[name]]
+
+        removed = np.setdiff1d(old["id"], new["id"], assume_unique=True)
+        parts += [COUNT.pack(len(removed)), removed.astype("<u4").tobytes()]
+
+        position = np.searchsorted(old["id"], new["id"])
+        position = np.minimum(position, max(len(old) - 1, 0))
+        existed = (old["id"][position] == new["id"]) if len(old) else np.zeros(len(new), dtype=bool)
+        masks = np.zeros(len(new), dtype=np.uint8)
+        for bit, field in enumerate(fields):
+            differs = ~existed
+            if len(old):
+                differs |= old[field][position] != new[field]
+            masks |= (differs.astype(np.uint8) << bit)
+
+        changed = masks != 0
+        parts += [COUNT.pack(int(changed.sum())), new["id"][changed].tobytes(), masks[changed].tobytes()]
+        for bit, field in enumerate(fields):
+            selected = (masks[changed] >> bit) & 1 == 1
+            parts.append(new[field][changed][selected].tobytes())
+    return b"".join(parts)
+
+
+def apply_delta(base, payload):
+    base = base or empty()
+    snapshot = {}
+    offset = 0
+    for name in CATEGORIES:
+        dtype = DTYPES[name]
+        fields = [field for field, _ in SCHEMA[name]]
+
+        (removed_count,), offset = COUNT.unpack_from(payload, offset), offset + COUNT.size
+        removed = np.frombuffer(payload, "<u4", removed_count, offset)
+        offset += removed.nbytes
+        (changed_count,), offset = COUNT.unpack_from(payload, offset), offset + COUNT.size
+        ids = np.frombuffer(payload, "<u4", changed_count, offset)
+        offset += ids.nbytes
+        masks = np.frombuffer(payload, np.uint8, changed_count, offset)
+        offset += masks.nbytes
+
+        old = base[name]
+        kept = old[~np.isin(old["id"], removed) & ~np.isin(old["id"], ids)]
+        changed = np.zeros(changed_count, dtype=dtype)
+        changed["id"] = ids
+        # незатронутые поля изменённых записей берутся из базы
+        in_old = np.isin(ids, old["id"])
+        if in_old.any():
+            changed[in_old] = old[np.searchsorted(old["id"], ids[in_old])]
+        for bit, field in enumerate(fields):
+            selected = (masks >> bit) & 1 == 1
+            count = int(selected.sum())
+            values = np.frombuffer(payload, dtype[field], count, offset)
+            offset += values.nbytes
+            changed[field][selected] = values
+
+        snapshot[name] = np.sort(np.concatenate((kept, changed)), order="id")
+    return snapshot
@@ -1,9 +1,24 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from config import CONSTANTS
+
+
 class SceneManager:
     _instance = None
 
     def __init__(self):
         self.scenes = {}
         self.current_scene = None
+        # тяжёлые сцены создаются по требованию, заранее - в фоновом потоке
+        self.factories = {}
+        self.preloads = {}
+        self.executor = None
+
+        # симуляция идёт фиксированными шагами, отрисовка интерполирует между ними
+        self.tick_ms = 1000 / CONSTANTS.get("TICK_RATE", CONSTANTS["FPS"])
+        self.max_ticks_per_frame = 5
+        self.accumulator = 0
+        self.alpha = 1.0
 
     @classmethod
     def get_instance(cls):
@@ -14,8 +29,28 @@ class SceneManager:
     def add(self, name, scene):
         self.scenes[name] = scene
 
+    def register(self, name, factory):
+        self.factories[name] = factory
+
+    def get(self, name):
+        if name not in self.scenes:
+            future = self.preloads.pop(name, None)
+            if future is not None:
+                # если загрузка ещё идёт, дожидаемся её, а не строим сцену второй раз
+                self.scenes[name] = future.result()
+            else:
+                self.scenes[name] = self.factories[name]()
+        return self.scenes[name]
+
+    def preload(self, name):
+        if name in self.scenes or name in self.preloads or name not in self.factories:
+            return
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scene-preload")
+        self.preloads[name] = self.executor.submit(self.factories[name])
+
     def set_scene(self, name):
-        self.current_scene = self.scenes[name]
+        self.current_scene = self.get(name)
         if hasattr(self.current_scene, 'on_enter'):
             self.current_scene.on_enter()
 
@@ -27,6 +62,21 @@ class SceneManager:
         if self.current_scene:
             self.current_scene.update()
 
+    def advance(self, elapsed_ms):
+        self.accumulator += elapsed_ms
+        ticks = 0
+        while self.accumulator >= self.tick_ms and ticks < self.max_ticks_per_frame:
+            self.update()
+            self.accumulator -= self.tick_ms
+            ticks += 1
+        if ticks == self.max_ticks_per_frame:
+            # не догоняем отставание бесконечно: при долгом кадре игра замедляется
+            self.accumulator %= self.tick_ms
+        self.alpha = self.accumulator / self.tick_ms
+        return ticks
+
     def render(self, screen):
         if self.current_scene:
+            if hasattr(self.current_scene, 'render_alpha'):
+                self.current_scene.render_alpha = self.alpha
             self.current_scene.render(screen)
\ No newline at end of file
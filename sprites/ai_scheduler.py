@@ -0,0 +1,47 @@
+import numpy as np
+from config import CONSTANTS
+
+ENEMY_CONFIG = CONSTANTS["enemy"]
+
+TIERS = ("near", "mid", "far")
+
+
+class AIScheduler:
+    # уровни детализации ИИ по расстоянию до ближайшего игрока:
+    # ближние думают каждый тик, средние - раз в mid_interval тиков с длинным шагом, дальние спят
+    def __init__(self):
+        self.near_range = ENEMY_CONFIG.get("ai_near_range", 1000)
+        self.mid_range = ENEMY_CONFIG.get("ai_mid_range", 2200)
+        self.mid_interval = ENEMY_CONFIG.get("ai_mid_interval", 4)
+        self.wake_duration = ENEMY_CONFIG.get("ai_wake_duration", 5000)
+        self.tick = 0
+        self.counts = dict.fromkeys(TIERS, 0)
+
+    def schedule(self, swarm, players, now):
+        self.tick += 1
+        count = len(swarm)
+        if not count or not players:
+            self.counts = dict.fromkeys(TIERS, 0)
+            return None, None
+
+        player_pos = np.array([p.rect.center for p in players], dtype=float)
+        dist_sq = ((swarm.pos[:, None, :] - player_pos[None, :, :]) ** 2).sum(axis=2).min(axis=1)
+
+        # разбуженные шумом ведут себя как ближние, пока не истечёт wake_until
+        near = (dist_sq <= self.near_range ** 2) | (swarm.wake_until >= now)
+        mid = ~near & (dist_sq <= self.mid_range ** 2)
+        # средние раскиданы по тикам, чтобы не думать все разом
+        due = mid & ((np.arange(count) + self.tick) % self.mid_interval == 0)
+
+        self.counts = {"near": int(near.sum()), "mid": int(mid.sum()), "far": int(count - near.sum() - mid.sum())}
+        return near | due, np.where(due, float(self.mid_interval), 1.0)
+
+    def noise(self, swarm, pos, radius, player_index, now):
+        # шум будит врагов в радиусе и даёт им точку, куда идти
+        if not len(swarm):
+            return
+        heard = ((swarm.pos - np.asarray(pos, dtype=float)) ** 2).sum(axis=1) <= radius ** 2
+        swarm.wake_until[heard] = now + self.wake_duration
+        swarm.known_pos[heard] = pos
+        swarm.known_player[heard] = player_index
+        swarm.last_seen[heard] = now
@@ -1,143 +1,72 @@
 import pygame as py
 import random
-import math
+import numpy as np
 from config import CONSTANTS
+from asset_manager import AssetManager
+from game_clock import GameClock
+from font_manager import FontManager
+from sprites.movement import move_rects
 
 ENEMY_CONFIG = CONSTANTS["enemy"]
 
+
+def swarm_property(field):
+    return property(
+        lambda self: getattr(self.swarm, field)[self.index],
+        lambda self, value: getattr(self.swarm, field).__setitem__(self.index, value),
+    )
+
+
 class Enemy(py.sprite.Sprite):
+    # тонкое представление одного врага: все данные лежат в массивах EnemySwarm
     enemy_images = []
+    # готовые кадры в масштабе: variants[facing_right][frame]
+    variants = ([], [])
 
     @classmethod
     def load_images(cls):
         if cls.enemy_images:
             return
         sheet_path = ENEMY_CONFIG["image"]
-        sheet = py.image.load(sheet_path).convert_alpha()
-        sheet_width, sheet_height = sheet.get_size()
-        frame_width = ENEMY_CONFIG["size"]
-        frame_height = sheet_height
-        num_frames = sheet_width // frame_width
-        cls.enemy_images = [
-            sheet.subsurface(py.Rect(i * frame_width, 0, frame_width, frame_height))
-            for i in range(num_frames)
-        ]
-
-    def __init__(self, weapons, players, existing_enemies=None, pos=None):
-        super().__init__()
-        Enemy.load_images()
-        self.image = random.choice(Enemy.enemy_images)
-        self.rect = self.image.get_rect()
-
-        if pos is not None:
-            self.rect.center = pos
-        else:
-            self.spawn_near_weapon(weapons, players, existing_enemies or [])
-
-        self.speed = ENEMY_CONFIG["speed"]
-        health_min, health_max = ENEMY_CONFIG["health_range"]
-        self.health = random.randint(health_min, health_max)
-        self.damage = ENEMY_CONFIG["damage"]
-        self.attack_delay = ENEMY_CONFIG["attack_delay"]
-        self.last_attack_time = py.time.get_ticks()
-        self.stunned = False
-        self.stun_end_time = 0
-
-        self.last_known_position = None
-        self.last_seen_time = 0
-        self.memory_duration = 15000
+        assets = AssetManager.get_instance()
+        frame_height = assets.get_image(sheet_path).get_height()
+        scale = ENEMY_CONFIG.get("scale", 1.0)
+        cls.enemy_images = assets.get_frames(sheet_path, ENEMY_CONFIG["size"], frame_height, scale)
+        # отражение
+        cls.variants = (
+            [py.transform.flip(image, True, False) for image in cls.enemy_images],
+            list(cls.enemy_images),
+        )
 
-        self.last_animation_time = py.time.get_ticks()
-        self.current_frame = 0
-        self.animation_speed = 200
-        self.image = Enemy.enemy_images[self.current_frame]
-        self.facing_right = True
-
-    def spawn_near_weapon(self, weapons, players, other_enemies):
-        min_dist = ENEMY_CONFIG["min_spawn_distance"]
-        max_attempts = 30
-        attempts = 0
-
-        while attempts < max_attempts:
-            if not weapons:
-                self.rect.topleft = (random.randint(100, 700), random.randint(100, 500))
-            else:
-                weapon = random.choice(weapons)
-                wx, wy = weapon.rect.center
-                offset_x = random.randint(-100, 100)
-                offset_y = random.randint(-100, 100)
-                self.rect.center = (wx + offset_x, wy + offset_y)
-
-            too_close_to_players = any(
-                (self.rect.centerx - p.rect.centerx) ** 2 + (self.rect.centery - p.rect.centery) ** 2 < min_dist ** 2
-                for p in players
-            )
-            overlaps_other_enemies = any(self.rect.colliderect(e.rect.inflate(-10, -10)) for e in other_enemies)
-
-            if not too_close_to_players and not overlaps_other_enemies:
-                return
-
-            attempts += 1
-        self.rect.topleft = (random.randint(100, 700), random.randint(100, 500))
-
-    def update(self, players, world_size, game_map=None):
-        now = py.time.get_ticks()
-        if self.stunned and now >= self.stun_end_time:
-            self.stunned = False
-
-        if self.stunned or not players:
-            return
+    health = swarm_property("health")
+    stunned = swarm_property("stunned")
+    stun_end_time = swarm_property("stun_end")
+    last_attack_time = swarm_property("last_attack")
+    current_frame = swarm_property("frame")
+    facing_right = swarm_property("facing_right")
 
-        closest_player = min(
-            players,
-            key=lambda p: (p.rect.centerx - self.rect.centerx) ** 2 + (p.rect.centery - self.rect.centery) ** 2
-        )
+    def __init__(self, swarm, index):
+        super().__init__()
+        self.swarm = swarm
+        self.index = index
 
-        player_pos = closest_player.rect.center
-        dx = player_pos[0] - self.rect.centerx
-        dy = player_pos[1] - self.rect.centery
-        distance = (dx ** 2 + dy ** 2) ** 0.5
+    @property
+    def rect(self):
+        return self.swarm.rect_at(self.swarm.pos[self.index])
 
-        vision_range = 700
+    @rect.setter
+    def rect(self, value):
+        self.swarm.pos[self.index] = value.center
 
-        can_see = False
-        if distance <= vision_range and game_map and self.can_see_player(closest_player, game_map):
-            can_see = True
-            self.last_known_position = player_pos
-            self.last_seen_time = now
+    @property
+    def image(self):
+        return Enemy.variants[int(self.facing_right)][self.current_frame]
 
-        if abs(dx) > 1:
-            self.facing_right = dx > 0
-        # запоминаем где был
-        if self.last_known_position and now - self.last_seen_time <= self.memory_duration:
-            self.move_towards(self.last_known_position, game_map)
-        # атака если рядом
-        if can_see and self.rect.colliderect(closest_player.rect) and now - self.last_attack_time > self.attack_delay:
-            closest_player.health -= self.damage
-            self.last_attack_time = now
-
-        if now - self.last_animation_time >= self.animation_speed:
-            self.current_frame = (self.current_frame + 1) % len(Enemy.enemy_images)
-            base_image = Enemy.enemy_images[self.current_frame]
-            # отражение
-            flipped = py.transform.flip(base_image, not self.facing_right, False)
-            scale = ENEMY_CONFIG.get("scale", 1.0)
-            if scale != 1.0:
-                width = int(flipped.get_width() * scale)
-                height = int(flipped.get_height() * scale)
-                flipped = py.transform.scale(flipped, (width, height))
-
-            self.image = flipped
-            self.rect = self.image.get_rect(center=self.rect.center)
-            self.last_animation_time = now
-
-    def draw(self, surface, camera_offset):
-        rel_pos = py.Vector2(self.rect.topleft) - camera_offset
-        surface.blit(self.image, rel_pos)
-
-        font = py.font.SysFont(None, 20)
-        hp_text = font.render(f"HP: {self.health}", True, (255, 0, 0))
-        surface.blit(hp_text, (rel_pos.x, rel_pos.y - 20))
+    def queue_draw(self, render_queue, alpha=1.0):
+        x, y = self.swarm.rect_at(self.swarm.render_center(self.index, alpha)).topleft
+        render_queue.add("enemies", self.image, (x, y))
+        render_queue.extend("enemy_labels", FontManager.get_instance().layout_number(
+            (x, y - 20), "HP: ", self.health, color=(255, 0, 0)))
 
     def draw_scaled(self, surface, scale_func):
         scaled_pos = scale_func(self.rect.topleft)
@@ -148,76 +77,6 @@ class Enemy(py.sprite.Sprite):
         scaled_image = py.transform.scale(self.image, scaled_size)
         surface.blit(scaled_image, scaled_pos)
 
-    def can_see_player(self, player, game_map):
-        x0, y0 = self.rect.center
-        x1, y1 = player.rect.center
-
-        dx = abs(x1 - x0)
-        dy = abs(y1 - y0)
-        x, y = x0, y0
-        sx = 1 if x1 > x0 else -1
-        sy = 1 if y1 > y0 else -1
-
-        if dx > dy:
-            err = dx / 2.0
-            while x != x1:
-                if not game_map.is_walkable(int(x), int(y)):
-                    return False
-                err -= dy
-                if err < 0:
-                    y += sy
-                    err += dx
-                x += sx
-        else:
-            err = dy / 2.0
-            while y != y1:
-                if not game_map.is_walkable(int(x), int(y)):
-                    return False
-                err -= dx
-                if err < 0:
-                    x += sx
-                    err += dy
-                y += sy
-
-        return True
-
-    def is_rect_valid(self, game_map):
-        points = [
-            self.rect.center,
-            self.rect.topleft,
-            self.rect.topright,
-            self.rect.bottomleft,
-            self.rect.bottomright
-        ]
-        return all(game_map.is_walkable(int(x), int(y)) for (x, y) in points)
-
-    def move_towards(self, target, game_map):
-        dx = target[0] - self.rect.centerx
-        dy = target[1] - self.rect.centery
-        distance = math.hypot(dx, dy)
-        if distance == 0:
-            return
-        dx /= distance
-        dy /= distance
-
-        original_rect = self.rect.copy()
-        self.rect.x += dx * self.speed
-        self.rect.y += dy * self.speed
-
-        if not self.is_rect_valid(game_map):
-            self.rect = original_rect
-            for angle in [30, -30, 45, -45, 60, -60]:
-                rad = math.radians(angle)
-                new_dx = dx * math.cos(rad) - dy * math.sin(rad)
-                new_dy = dx * math.sin(rad) + dy * math.cos(rad)
-
-                self.rect.x = original_rect.x + new_dx * self.speed
-                self.rect.y = original_rect.y + new_dy * self.speed
-                if self.is_rect_valid(game_map):
-                    break
-                else:
-                    self.rect = original_rect
-
     def load_sprite_strip(image_path, frame_width, frame_height):
         sprite_sheet = py.image.load(image_path).convert_alpha()
         sheet_width = sprite_sheet.get_width()
@@ -228,4 +87,199 @@ class Enemy(py.sprite.Sprite):
             frame = sprite_sheet.subsurface(py.Rect(i * frame_width, 0, frame_width, frame_height))
             frames.append(frame)
 
-        return frames
\ No newline at end of file
+        return frames
+
+
+class EnemySwarm:
+    # все враги уровня в параллельных массивах, один тик = несколько операций над массивами
+    ARRAYS = ("pos", "health", "stunned", "stun_end", "last_attack", "last_seen",
+              "known_pos", "known_player", "frame", "facing_right", "animation_phase", "previous_pos",
+              "wake_until", "indexed_pos")
+
+    def __init__(self):
+        self.speed = ENEMY_CONFIG["speed"]
+        self.damage = ENEMY_CONFIG["damage"]
+        self.attack_delay = ENEMY_CONFIG["attack_delay"]
+        self.memory_duration = 15000
+        self.animation_speed = 200
+        self.size = (0, 0)
+        self.clear()
+
+    def __len__(self):
+        return len(self.views)
+
+    def __iter__(self):
+        return iter(list(self.views))
+
+    def clear(self):
+        for view in getattr(self, "views", []):
+            self.detach(view)
+        self.views = []
+        self.pos = np.zeros((0, 2), dtype=float)
+        self.health = np.zeros(0, dtype=np.int64)
+        self.stunned = np.zeros(0, dtype=bool)
+        self.stun_end = np.zeros(0, dtype=np.int64)
+        self.last_attack = np.zeros(0, dtype=np.int64)
+        self.last_seen = np.zeros(0, dtype=np.int64)
+        self.known_pos = np.zeros((0, 2), dtype=float)
+        self.known_player = np.zeros(0, dtype=np.int64)
+        self.frame = np.zeros(0, dtype=np.int64)
+        self.facing_right = np.zeros(0, dtype=bool)
+        self.animation_phase = np.zeros(0, dtype=np.int64)
+        self.previous_pos = np.zeros((0, 2), dtype=float)
+        self.wake_until = np.zeros(0, dtype=np.int64)
+        self.indexed_pos = np.zeros((0, 2), dtype=float)
+
+    def rect_at(self, center):
+        if self.size == (0, 0):
+            Enemy.load_images()
+            self.size = Enemy.variants[True][0].get_size()
+        w, h = self.size
+        return py.Rect(round(center[0]) - w // 2, round(center[1]) - h // 2, w, h)
+
+    def spawn(self, center):
+        self.rect_at(center)
+        now = GameClock.get_instance().get_ticks()
+        health_min, health_max = ENEMY_CONFIG["health_range"]
+        row = {
+            "pos": [center], "health": [random.randint(health_min, health_max)],
+            "stunned": [False], "stun_end": [0], "last_attack": [now], "last_seen": [0],
+            "known_pos": [center], "known_player": [-1], "frame": [0],
+            "facing_right": [True], "animation_phase": [-(now // self.animation_speed)],
+            "previous_pos": [center], "wake_until": [0], "indexed_pos": [center],
+        }
+        for name in self.ARRAYS:
+            current = getattr(self, name)
+            setattr(self, name, np.concatenate((current, np.asarray(row[name], dtype=current.dtype))))
+
+        view = Enemy(self, len(self.views))
+        self.views.append(view)
+        return view
+
+    def subset(self, indices):
+        part = EnemySwarm()
+        part.size = self.size
+        for name in self.ARRAYS:
+            setattr(part, name, getattr(self, name)[indices].copy())
+        return part
+
+    def detach(self, view):
+        # убитый враг может ещё лежать в словарях снарядов: даём ему собственную копию данных
+        view.swarm = self.subset([view.index])
+        view.swarm.views = [view]
+        view.index = 0
+
+    def remove_dead(self):
+        dead = self.health <= 0
+        if not dead.any():
+            return []
+
+        removed = [view for view, is_dead in zip(self.views, dead) if is_dead]
+        for view in removed:
+            self.detach(view)
+
+        alive = np.flatnonzero(~dead)
+        for name in self.ARRAYS:
+            setattr(self, name, getattr(self, name)[alive])
+        self.views = [self.views[i] for i in alive]
+        for index, view in enumerate(self.views):
+            view.index = index
+        return removed
+
+    def render_center(self, index, alpha=1.0):
+        previous = self.previous_pos[index]
+        return previous + (self.pos[index] - previous) * alpha
+
+    def take_moved(self):
+        # враги, сдвинувшиеся с последней переиндексации; спящих перебирать не нужно
+        moved = np.flatnonzero((self.pos != self.indexed_pos).any(axis=1))
+        self.indexed_pos[moved] = self.pos[moved]
+        return [self.views[i] for i in moved]
+
+    def update(self, players, game_map, line_of_sight, navigation=None, scheduled=None, step_scale=None):
+        # scheduled/step_scale - от AIScheduler: кто думает в этот тик и во сколько раз длиннее его шаг
+        self.previous_pos[:] = self.pos
+        now = GameClock.get_instance().get_ticks()
+        expired = self.stunned & (now >= self.stun_end)
+        self.stunned[expired] = False
+
+        thinking = ~self.stunned if scheduled is None else ~self.stunned & scheduled
+        active = np.flatnonzero(thinking)
+        if not active.size or not players:
+            return
+
+        player_pos = np.array([p.rect.center for p in players], dtype=float)
+        closest, visible = line_of_sight.resolve(self.pos[active], player_pos)
+        target = player_pos[closest]
+
+        dx = target[:, 0] - self.pos[active, 0]
+        turning = np.abs(dx) > 1
+        self.facing_right[active[turning]] = dx[turning] > 0
+
+        seen = active[visible]
+        self.known_pos[seen] = target[visible]
+        self.known_player[seen] = closest[visible]
+        self.last_seen[seen] = now
+
+        # запоминаем где был
+        remembers = (self.known_player[active] >= 0) & (now - self.last_seen[active] <= self.memory_duration)
+        self.move(active[remembers], players, game_map, navigation, step_scale)
+
+        # атака если рядом
+        self.attack(active, players, closest, visible, now)
+        self.animate(active, now)
+
+    def move(self, indices, players, game_map, navigation, step_scale=None):
+        if not indices.size:
+            return
+
+        pos = self.pos[indices]
+        direction = np.zeros_like(pos)
+        found = np.zeros(len(indices), dtype=bool)
+        if navigation is not None:
+            # поле ведёт к игроку сейчас, поэтому по нему идут только те, чья цель в клетке игрока:
+            # видевшие его в этот тик; потерявшие из виду и услышавшие шум идут к known_pos
+            known_cells = (self.known_pos[indices] // navigation.cell_size).astype(np.int64)
+            for player_index, player in enumerate(players):
+                player_cell = np.array(player.rect.center, dtype=np.int64) // navigation.cell_size
+                chasing = (self.known_player[indices] == player_index) & (known_cells == player_cell).all(axis=1)
+                if chasing.any():
+                    direction[chasing], found[chasing] = navigation.directions_to(player, pos[chasing])
+
+        # остальные и все без поля направлений идут по прямой к последней известной позиции
+        direct = ~found
+        offset = self.known_pos[indices[direct]] - pos[direct]
+        length = np.hypot(offset[:, 0], offset[:, 1])
+        direction[direct] = np.where(length[:, None] > 0, offset / np.maximum(length, 1e-9)[:, None], 0)
+
+        speed = self.speed if step_scale is None else self.speed * step_scale[indices, None]
+        self.pos[indices] = self.resolve_moves(pos, direction * speed, game_map)
+
+    def resolve_moves(self, pos, step, game_map):
+        # прямоугольники заметаются по осям; упёршийся враг встаёт вплотную к стене и скользит
+        w, h = self.size
+        start = np.rint(pos).astype(np.int64)
+        target = np.rint(pos + step).astype(np.int64)
+        lefts, tops, normals = move_rects(game_map, start[:, 0] - w // 2, start[:, 1] - h // 2, w, h,
+                                          target[:, 0] - start[:, 0], target[:, 1] - start[:, 1])
+        snapped = np.column_stack((lefts + w // 2, tops + h // 2))
+        return np.where(normals != 0, snapped, pos + step)
+
+    def attack(self, active, players, closest, visible, now):
+        w, h = self.size
+        left = np.rint(self.pos[active, 0]).astype(np.int64) - w // 2
+        top = np.rint(self.pos[active, 1]).astype(np.int64) - h // 2
+        player_rects = np.array([tuple(p.rect) for p in players], dtype=np.int64)[closest]
+        touching = (
+            (left < player_rects[:, 0] + player_rects[:, 2]) & (left + w > player_rects[:, 0]) &
+            (top < player_rects[:, 1] + player_rects[:, 3]) & (top + h > player_rects[:, 1])
+        )
+        ready = visible & touching & (now - self.last_attack[active] > self.attack_delay)
+        for player_index in closest[ready]:
+            players[player_index].health -= self.damage
+        self.last_attack[active[ready]] = now
+
+    def animate(self, active, now):
+        # общие часы анимации: кадр = номер тика часов + сдвиг врага
+        clock_tick = now // self.animation_speed
+        self.frame[active] = (clock_tick + self.animation_phase[active]) % len(Enemy.enemy_images)
@@ -0,0 +1,59 @@
+class ComponentStore:
+    # компоненты одного типа: id сущности -> значение
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+        self.by_id = {}
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __contains__(self, entity_id):
+        return entity_id in self.by_id
+
+    def __iter__(self):
+        # без копии: destroy во время обхода только помечает сущность, словари меняют create и flush
+        return (value for entity_id, value in self.items())
+
+    def items(self):
+        pending = self.registry.pending
+        if not pending:
+            return iter(self.by_id.items())
+        return ((entity_id, value) for entity_id, value in self.by_id.items() if entity_id not in pending)
+
+    def get(self, entity_id, default=None):
+        return self.by_id.get(entity_id, default)
+
+
+class EntityRegistry:
+    def __init__(self):
+        self.next_id = 1
+        self.stores = {}
+        # удаление откладывается до flush() в конце тика
+        self.pending = set()
+
+    def store(self, name):
+        if name not in self.stores:
+            self.stores[name] = ComponentStore(self, name)
+        return self.stores[name]
+
+    def create(self, **components):
+        entity_id = self.next_id
+        self.next_id += 1
+        for name, value in components.items():
+            self.store(name).by_id[entity_id] = value
+        return entity_id
+
+    def destroy(self, entity_id):
+        self.pending.add(entity_id)
+
+    def flush(self):
+        for entity_id in self.pending:
+            for store in self.stores.values():
+                store.by_id.pop(entity_id, None)
+        self.pending.clear()
+
+    def clear(self):
+        for store in self.stores.values():
+            store.by_id.clear()
+        self.pending.clear()
@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from sprites.line_of_sight import LOS_CELL_SIZE
+from sprites.navigation import NAV_CELL_SIZE
+
+# собранный уровень: заголовок JSON + выровненные массивы, читается через memmap
+BUNDLE_MAGIC = b"LVLB"
+BUNDLE_VERSION = 3
+BUNDLE_ALIGN = 64
+BUNDLE_GRIDS = (LOS_CELL_SIZE, NAV_CELL_SIZE)
+# точки появления хранятся по размеру прямоугольника: spawn_points_32x32, spawn_points_64x48
+SPAWN_PREFIX = "spawn_points_"
+
+
+def bundle_path(level_file):
+    return os.path.splitext(level_file)[0] + ".bundle"
+
+
+def source_hash(level_file, map_data):
+    # бандл устаревает при любом изменении json уровня, картинок или формата
+    digest = hashlib.sha1(str(BUNDLE_VERSION).encode())
+    for path in (level_file, map_data["background"], map_data["walls"]):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def aligned(size):
+    return -(-size // BUNDLE_ALIGN) * BUNDLE_ALIGN
+
+
+def write_bundle(path, source, size, arrays):
+    sections = {}
+    offset = 0
+    for name, array in arrays.items():
+        sections[name] = {"offset": offset, "dtype": array.dtype.str, "shape": list(array.shape)}
+        offset += aligned(array.nbytes)
+
+    header = {"version": BUNDLE_VERSION, "source": source, "size": list(size), "sections": sections}
+    header_bytes = json.dumps(header).encode("utf-8")
+    data_start = aligned(len(BUNDLE_MAGIC) + 4 + len(header_bytes))
+
+    # пишем во временный файл, чтобы загрузчик никогда не увидел бандл наполовину
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(BUNDLE_MAGIC)
+        f.write(len(header_bytes).to_bytes(4, "little"))
+        f.write(header_bytes)
+        for name, array in arrays.items():
+            f.seek(data_start + sections[name]["offset"])
+            f.write(np.ascontiguousarray(array).tobytes())
+    os.replace(tmp_path, path)
+
+
+def read_bundle(path):
+    with open(path, "rb") as f:
+        if f.read(len(BUNDLE_MAGIC)) != BUNDLE_MAGIC:
+            return None, {}
+        header_len = int.from_bytes(f.read(4), "little")
+        header = json.loads(f.read(header_len).decode("utf-8"))
+    if header.get("version") != BUNDLE_VERSION:
+        return None, {}
+
+    data = np.memmap(path, dtype=np.uint8, mode="r")
+    data_start = aligned(len(BUNDLE_MAGIC) + 4 + header_len)
+    arrays = {}
+    for name, section in header["sections"].items():
+        dtype = np.dtype(section["dtype"])
+        shape = tuple(section["shape"])
+        start = data_start + section["offset"]
+        count = int(np.prod(shape)) * dtype.itemsize
+        arrays[name] = data[start:start + count].view(dtype).reshape(shape)
+    return header, arrays
+
+
+def compile_level(level_file, map_data, game_map, spawn_sizes=()):
+    # game_map построена из png; сохраняем то, что иначе считалось бы при каждом запуске.
+    # spawn_sizes - размеры, под которые нужны точки появления помимо оружия (враги)
+    w, h = game_map.size
+    arrays = {
+        "walkable": np.packbits(game_map.walkable, axis=None),
+        "blocked_sat": game_map.blocked_sat,
+    }
+    for cell_size in BUNDLE_GRIDS:
+        arrays[f"occupancy_{cell_size}"] = game_map.occupancy_grid(cell_size)
+    for rect_size in spawn_sizes:
+        game_map.spawn_points_for(rect_size)
+    for (rect_w, rect_h), points in game_map.spawn_point_sets.items():
+        arrays[f"{SPAWN_PREFIX}{rect_w}x{rect_h}"] = np.asarray(points, dtype=np.int32)
+
+    path = bundle_path(level_file)
+    write_bundle(path, source_hash(level_file, map_data), (w, h), arrays)
+    return path
+
+
+def load_level_bundle(level_file, map_data):
+    # None, если бандла нет или он собран из других исходников: тогда карта считается из png
+    path = bundle_path(level_file)
+    if not os.path.exists(path):
+        return None
+    header, arrays = read_bundle(path)
+    if header is None or header["source"] != source_hash(level_file, map_data):
+        return None
+
+    # маленькие массивы копируются из memmap: индексация memmap на каждом тике заметно дороже
+    w, h = header["size"]
+    return {
+        "size": (w, h),
+        "walkable": np.unpackbits(arrays["walkable"], count=w * h).reshape(w, h).view(bool),
+        "occupancy": {cell_size: np.array(arrays[f"occupancy_{cell_size}"]) for cell_size in BUNDLE_GRIDS},
+        "spawn_points": {
+            tuple(int(v) for v in name[len(SPAWN_PREFIX):].split("x")): np.array(points)
+            for name, points in arrays.items() if name.startswith(SPAWN_PREFIX)
+        },
+        # таблица сумм большая: остаётся в отображённом файле, страницы подгружаются по мере обращений
+        "blocked_sat": arrays["blocked_sat"].view(np.ndarray),
+    }
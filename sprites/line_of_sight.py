@@ -0,0 +1,41 @@
+import numpy as np
+from config import CONSTANTS
+
+ENEMY_CONFIG = CONSTANTS["enemy"]
+
+LOS_CELL_SIZE = 8
+
+
+class LineOfSight:
+    def __init__(self, game_map, cell_size=LOS_CELL_SIZE):
+        self.cell_size = cell_size
+        self.blocked = game_map.occupancy_grid(cell_size)
+        self.vision_range = ENEMY_CONFIG.get("vision_range", 700)
+
+    def resolve(self, enemy_pos, player_pos):
+        # все лучи враг -> ближайший игрок за тик проверяются одним проходом
+        offsets = player_pos[None, :, :] - enemy_pos[:, None, :]
+        dist_sq = (offsets ** 2).sum(axis=2)
+        closest = dist_sq.argmin(axis=1)
+        rows = np.arange(len(enemy_pos))
+        distance = np.sqrt(dist_sq[rows, closest])
+
+        visible = distance <= self.vision_range
+        rays = np.flatnonzero(visible & (distance > 0))
+        if len(rays):
+            visible[rays] = self.trace(enemy_pos[rays], offsets[rays, closest[rays]], distance[rays])
+        return closest, visible
+
+    def trace(self, starts, offsets, distance):
+        step = self.cell_size / 2
+        t = np.arange(int(distance.max() // step) + 1) * step
+        directions = offsets / distance[:, None]
+        points = starts[:, None, :] + directions[:, None, :] * t[None, :, None]
+
+        # клетки у самого врага и у игрока не считаются: они могут касаться стены
+        in_ray = (t[None, :] >= self.cell_size) & (t[None, :] <= distance[:, None] - self.cell_size)
+        cells = (points // self.cell_size).astype(np.int64)
+        cols, rows = self.blocked.shape
+        cx = np.clip(cells[:, :, 0], 0, cols - 1)
+        cy = np.clip(cells[:, :, 1], 0, rows - 1)
+        return ~(self.blocked[cx, cy] & in_ray).any(axis=1)
@@ -1,22 +1,192 @@
 import pygame as py
+import numpy as np
+import random
+
+TILE_SIZE = 512
+# оружие на карте 32x32, кандидаты берутся с шагом в полклетки
+SPAWN_RECT_SIZE = (32, 32)
+SPAWN_STRIDE = 16
+SPAWN_MARGIN = 32
+
 
 class Map:
-    def __init__(self, map_data):
-        self.background = py.image.load(map_data["background"]).convert_alpha()
-        self.walls = py.image.load(map_data["walls"]).convert_alpha()
+    def __init__(self, map_data, background_color=(40, 40, 40), bundle=None, render=True):
+        # render=False - карта без картинки (headless, сервер, сборка уровней): тайлы не нужны
+        self.tiles = []
+        self.images = None
+        self.background_color = background_color
+        self.sat = None
+        if bundle is not None:
+            # всё про проходимость уже посчитано в собранном уровне (level_bundle.py)
+            self.size = bundle["size"]
+            self.walkable = bundle["walkable"]
+            self.occupancy_grids = dict(bundle["occupancy"])
+            self.spawn_point_sets = dict(bundle["spawn_points"])
+            self.sat = bundle["blocked_sat"]
+            if render:
+                self.images = self.load_images(map_data)
+        else:
+            background, walls = self.load_images(map_data)
+            self.size = background.get_size()
+            # маска проходимости [x, y], считается один раз при загрузке
+            self.walkable = self.build_walkable_mask(background, walls)
+            self.occupancy_grids = {}
+            self.spawn_point_sets = {}
+            if render:
+                self.images = (background, walls)
+        self.spawn_points = self.spawn_points_for(SPAWN_RECT_SIZE)
+
+    @staticmethod
+    def load_images(map_data):
+        # только декодирование в 32 бита с альфой: формат окна не нужен, можно звать из фонового потока
+        background = py.image.load(map_data["background"]).convert(32, py.SRCALPHA)
+        walls = py.image.load(map_data["walls"]).convert(32, py.SRCALPHA)
+        return background, walls
+
+    def prepare_render(self):
+        # тайлы в формате окна собираются в главном потоке (convert() читает режим экрана)
+        if self.images is not None:
+            self.tiles = self.build_tiles(*self.images, self.background_color)
+            self.images = None
+
+    def build_walkable_mask(self, background, walls):
+        bg_color, bg_alpha = self.pixel_channels(background)
+        void = ~bg_color & (bg_alpha == 255)
+        wall_color, wall_alpha = self.pixel_channels(walls)
+        wall = wall_color & (wall_alpha != 0)  # стена есть
+        return ~(void | wall)
+
+    @staticmethod
+    def pixel_channels(surface):
+        # pixels2d не копирует пиксели, ссылку надо отпустить до первого blit
+        r_mask, g_mask, b_mask, a_mask = surface.get_masks()
+        a_shift = surface.get_shifts()[3]
+        pixels = py.surfarray.pixels2d(surface)
+        has_color = (pixels & (r_mask | g_mask | b_mask)) != 0
+        alpha = ((pixels & a_mask) >> a_shift).astype(np.uint8)
+        del pixels
+        return has_color, alpha
+
+    def build_tiles(self, background, walls, background_color):
+        layer = py.Surface(self.size)
+        layer.fill(background_color)
+        layer.blit(background, (0, 0))
+        layer.blit(walls, (0, 0))
+
+        w, h = self.size
+        tiles = []
+        for col in range(0, w, TILE_SIZE):
+            column = []
+            for row in range(0, h, TILE_SIZE):
+                rect = py.Rect(col, row, TILE_SIZE, TILE_SIZE).clip(layer.get_rect())
+                column.append(layer.subsurface(rect).convert())
+            tiles.append(column)
+        return tiles
 
     def draw(self, surface, offset=(0, 0)):
-        surface.blit(self.background, offset)
-        surface.blit(self.walls, offset)
+        # рисуются только тайлы, попавшие в камеру
+        ox, oy = int(offset[0]), int(offset[1])
+        view_w, view_h = surface.get_size()
+        first_col = max(0, -ox // TILE_SIZE)
+        first_row = max(0, -oy // TILE_SIZE)
+        last_col = min(len(self.tiles) - 1, (view_w - ox) // TILE_SIZE)
+        last_row = min(len(self.tiles[0]) - 1, (view_h - oy) // TILE_SIZE)
+
+        surface.blits([
+            (self.tiles[col][row], (col * TILE_SIZE + ox, row * TILE_SIZE + oy))
+            for col in range(first_col, last_col + 1)
+            for row in range(first_row, last_row + 1)
+        ], False)
 
     def is_walkable(self, x, y):
-        w, h = self.background.get_size()
+        w, h = self.size
         if 0 <= x < w and 0 <= y < h:
-            bg_color = self.background.get_at((x, y))
-            wall_color = self.walls.get_at((x, y))
-            if bg_color == (0, 0, 0, 255):
-                return False
-            if wall_color[:3] != (0, 0, 0) and wall_color[3] != 0:  # стена есть
-                return False
-            return True
+            return bool(self.walkable[int(x), int(y)])
         return False
+
+    def are_walkable(self, points):
+        points = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+        xs, ys = points[:, 0], points[:, 1]
+        w, h = self.size
+        inside = (xs >= 0) & (xs < w) & (ys >= 0) & (ys < h)
+        result = np.zeros(len(points), dtype=bool)
+        result[inside] = self.walkable[xs[inside], ys[inside]]
+        return result
+
+    @property
+    def blocked_sat(self):
+        # таблица сумм непроходимых пикселей: проверка прямоугольника за O(1);
+        # берётся из бандла, без него строится при первой проверке
+        if self.sat is None:
+            self.sat = self.build_blocked_sat()
+        return self.sat
+
+    def build_blocked_sat(self):
+        # sat[x, y] - число непроходимых пикселей в [0, x) x [0, y)
+        w, h = self.size
+        sat = np.zeros((w + 1, h + 1), dtype=np.int32)
+        np.cumsum(~self.walkable, axis=0, dtype=np.int32, out=sat[1:, 1:])
+        np.cumsum(sat[1:, 1:], axis=1, out=sat[1:, 1:])
+        return sat
+
+    def is_rect_walkable(self, rect):
+        rect = py.Rect(rect)
+        w, h = self.size
+        if rect.left < 0 or rect.top < 0 or rect.right > w or rect.bottom > h:
+            return False
+        sat = self.blocked_sat
+        l, t, r, b = rect.left, rect.top, rect.right, rect.bottom
+        return bool(sat[r, b] - sat[l, b] - sat[r, t] + sat[l, t] == 0)
+
+    def spawn_points_for(self, rect_size):
+        # кандидаты считаются один раз на размер (оружие, враги); собранный уровень приносит их готовыми
+        rect_size = tuple(int(v) for v in rect_size)
+        if rect_size not in self.spawn_point_sets:
+            self.spawn_point_sets[rect_size] = self.find_spawn_points(rect_size)
+        return self.spawn_point_sets[rect_size]
+
+    def find_spawn_points(self, rect_size=SPAWN_RECT_SIZE, stride=SPAWN_STRIDE, margin=SPAWN_MARGIN):
+        # левые верхние углы прямоугольников rect_size (w, h) на сетке stride, целиком лежащих на проходимом
+        free = ~self.occupancy_grid(stride)
+        span_x = -(-rect_size[0] // stride)
+        span_y = -(-rect_size[1] // stride)
+        cols, rows = free.shape
+        fits = np.ones((cols - span_x + 1, rows - span_y + 1), dtype=bool)
+        for dx in range(span_x):
+            for dy in range(span_y):
+                fits &= free[dx:cols - span_x + 1 + dx, dy:rows - span_y + 1 + dy]
+
+        points = np.argwhere(fits) * stride
+        w, h = self.size
+        inside = ((points[:, 0] >= margin) & (points[:, 0] <= w - margin) &
+                  (points[:, 1] >= margin) & (points[:, 1] <= h - margin))
+        return points[inside].astype(np.int32)
+
+    def random_spawn_point(self):
+        if not len(self.spawn_points):
+            return None
+        x, y = self.spawn_points[random.randrange(len(self.spawn_points))]
+        return int(x), int(y)
+
+    def are_rects_walkable(self, lefts, tops, widths, heights):
+        # то же для массивов прямоугольников; всё, что выходит за карту, непроходимо
+        w, h = self.size
+        rights = lefts + widths
+        bottoms = tops + heights
+        inside = (lefts >= 0) & (tops >= 0) & (rights <= w) & (bottoms <= h)
+        l, r = np.clip(lefts, 0, w), np.clip(rights, 0, w)
+        t, b = np.clip(tops, 0, h), np.clip(bottoms, 0, h)
+        sat = self.blocked_sat
+        return inside & (sat[r, b] - sat[l, b] - sat[r, t] + sat[l, t] == 0)
+
+    def occupancy_grid(self, cell_size):
+        # клетка занята, если в ней есть хотя бы один непроходимый пиксель
+        if cell_size not in self.occupancy_grids:
+            w, h = self.size
+            cols = -(-w // cell_size)
+            rows = -(-h // cell_size)
+            padded = np.zeros((cols * cell_size, rows * cell_size), dtype=bool)
+            padded[:w, :h] = self.walkable
+            cells = padded.reshape(cols, cell_size, rows, cell_size)
+            self.occupancy_grids[cell_size] = ~cells.all(axis=(1, 3))
+        return self.occupancy_grids[cell_size]
@@ -0,0 +1,72 @@
+import numpy as np
+import pygame as py
+
+
+def swept_strips(lefts, tops, widths, heights, distance, sign, axis):
+    # полоса, которую прямоугольник заметает при сдвиге на distance, без него самого
+    if axis == 0:
+        strip_lefts = np.where(sign > 0, lefts + widths, lefts - distance)
+        return strip_lefts, tops, distance, heights
+    strip_tops = np.where(sign > 0, tops + heights, tops - distance)
+    return lefts, strip_tops, widths, distance
+
+
+def sweep_axis(game_map, lefts, tops, widths, heights, shifts, axis):
+    # самый длинный свободный сдвиг вдоль оси: полосы вложены, поэтому работает бинарный поиск
+    distance = np.abs(shifts)
+    sign = np.sign(shifts)
+    lo = np.zeros_like(distance)
+    hi = distance.copy()
+    mid = hi  # обычно весь шаг свободен, его и проверяем первым
+    while True:
+        pending = lo < hi
+        if not pending.any():
+            break
+        free = game_map.are_rects_walkable(*swept_strips(lefts, tops, widths, heights, mid, sign, axis))
+        lo = np.where(pending & free, mid, lo)
+        hi = np.where(pending & ~free, mid - 1, hi)
+        mid = (lo + hi + 1) // 2
+    return sign * lo, np.where(lo < distance, -sign, 0)
+
+
+def move_rects(game_map, lefts, tops, widths, heights, dx, dy):
+    # сначала по x, потом по y: упёршись в стену по одной оси, прямоугольник скользит по другой
+    lefts = np.asarray(lefts, dtype=np.int64)
+    tops = np.asarray(tops, dtype=np.int64)
+    widths = np.broadcast_to(np.asarray(widths, dtype=np.int64), lefts.shape)
+    heights = np.broadcast_to(np.asarray(heights, dtype=np.int64), lefts.shape)
+
+    moved_x, normal_x = sweep_axis(game_map, lefts, tops, widths, heights, np.asarray(dx, dtype=np.int64), 0)
+    lefts = lefts + moved_x
+    moved_y, normal_y = sweep_axis(game_map, lefts, tops, widths, heights, np.asarray(dy, dtype=np.int64), 1)
+    tops = tops + moved_y
+    return lefts, tops, np.column_stack((normal_x, normal_y))
+
+
+def sweep_rect_axis(game_map, rect, shift, axis):
+    # то же, что sweep_axis, но для одного прямоугольника на обычных int: без накладных расходов numpy
+    distance = abs(shift)
+    sign = 1 if shift > 0 else -1
+    lo, hi = 0, distance
+    mid = hi
+    while lo < hi:
+        if axis == 0:
+            strip = (rect.right if sign > 0 else rect.left - mid, rect.top, mid, rect.height)
+        else:
+            strip = (rect.left, rect.bottom if sign > 0 else rect.top - mid, rect.width, mid)
+        if game_map.is_rect_walkable(strip):
+            lo = mid
+        else:
+            hi = mid - 1
+        mid = (lo + hi + 1) // 2
+    return sign * lo, -sign if lo < distance else 0
+
+
+def move_rect(game_map, rect, dx, dy):
+    # возвращает новый прямоугольник и нормаль контакта (0, 0) - если ни во что не упёрлись
+    rect = rect.copy()
+    moved_x, normal_x = sweep_rect_axis(game_map, rect, int(dx), 0)
+    rect.x += moved_x
+    moved_y, normal_y = sweep_rect_axis(game_map, rect, int(dy), 1)
+    rect.y += moved_y
+    return rect, (normal_x, normal_y)
@@ -0,0 +1,155 @@
+import numpy as np
+from config import CONSTANTS
+
+ENEMY_CONFIG = CONSTANTS["enemy"]
+
+NAV_CELL_SIZE = 32
+STEPS = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+
+def shifted(grid, dx, dy, fill=False):
+    # result[x, y] = grid[x - dx, y - dy]
+    result = np.full_like(grid, fill)
+    cols, rows = grid.shape
+    result[max(dx, 0):cols + min(dx, 0), max(dy, 0):rows + min(dy, 0)] = \
+        grid[max(-dx, 0):cols + min(-dx, 0), max(-dy, 0):rows + min(-dy, 0)]
+    return result
+
+
+def step_slices(dx, dy, shape):
+    # срезы (куда, откуда) для сдвига result[x, y] = grid[x - dx, y - dy] без лишних массивов
+    cols, rows = shape
+    dst = (slice(max(dx, 0), cols + min(dx, 0)), slice(max(dy, 0), rows + min(dy, 0)))
+    src = (slice(max(-dx, 0), cols + min(-dx, 0)), slice(max(-dy, 0), rows + min(-dy, 0)))
+    return dst, src
+
+
+class FlowField:
+    def __init__(self, free, can_enter, cell_size, max_distance):
+        self.free = free
+        self.can_enter = can_enter
+        self.cell_size = cell_size
+        self.max_distance = max_distance
+        self.target_cell = None
+        self.stale = False
+        # поле хранится только в окне max_distance вокруг игрока: дальше волна всё равно не доходит
+        self.origin = (0, 0)
+        self.distance = np.full((0, 0), -1, dtype=np.int32)
+        self.next_step = np.zeros((0, 0, 2), dtype=np.int8)
+        self.has_step = np.zeros((0, 0), dtype=bool)
+
+    def cell_of(self, pos):
+        cols, rows = self.free.shape
+        cx = min(max(int(pos[0]) // self.cell_size, 0), cols - 1)
+        cy = min(max(int(pos[1]) // self.cell_size, 0), rows - 1)
+        return cx, cy
+
+    def update(self, target_pos):
+        # пересчёт откладывается до первого запроса: за игроком может никто не гнаться
+        cell = self.cell_of(target_pos)
+        if cell != self.target_cell:
+            self.target_cell = cell
+            self.stale = True
+
+    def rebuild(self):
+        self.stale = False
+        cols, rows = self.free.shape
+        tx, ty = self.target_cell
+        reach = self.max_distance
+        x0, x1 = max(tx - reach - 1, 0), min(tx + reach + 2, cols)
+        y0, y1 = max(ty - reach - 1, 0), min(ty + reach + 2, rows)
+        shape = (x1 - x0, y1 - y0)
+        can_enter = {step: grid[x0:x1, y0:y1] for step, grid in self.can_enter.items()}
+        target = (tx - x0, ty - y0)
+
+        # BFS волной от клетки игрока: одна итерация numpy на одно кольцо
+        distance = np.full(shape, -1, dtype=np.int32)
+        visited = np.zeros(shape, dtype=bool)
+        frontier = np.zeros(shape, dtype=bool)
+        frontier[target] = True
+        visited[target] = True
+        distance[target] = 0
+
+        forward = {(dx, dy): step_slices(dx, dy, shape) for dx, dy in STEPS}
+        for step in range(1, reach + 1):
+            reached = np.zeros(shape, dtype=bool)
+            for dx, dy in STEPS:
+                dst, src = forward[(dx, dy)]
+                reached[dst] |= frontier[src] & can_enter[(dx, dy)][dst]
+            reached &= ~visited
+            if not reached.any():
+                break
+            visited |= reached
+            distance[reached] = step
+            frontier = reached
+
+        # каждая клетка смотрит на соседа, который на шаг ближе к игроку;
+        # клетки, задевающие стену, смотрят на ближайшую клетку поля
+        next_step = np.zeros(shape + (2,), dtype=np.int8)
+        no_step = np.iinfo(np.int32).max
+        best = np.where(visited, distance, no_step)
+        for dx, dy in STEPS:
+            # сосед (x + dx, y + dy), в который можно войти из (x, y)
+            dst, src = step_slices(-dx, -dy, shape)
+            neighbour = distance[src]
+            better = can_enter[(dx, dy)][src] & (neighbour >= 0) & (neighbour < best[dst])
+            best[dst] = np.where(better, neighbour, best[dst])
+            next_step[dst][better] = (dx, dy)
+
+        self.origin = (x0, y0)
+        self.distance = distance
+        self.next_step = next_step
+        self.has_step = (best != no_step) & (distance != 0)
+
+    def directions_at(self, positions):
+        if self.stale:
+            self.rebuild()
+        cols, rows = self.distance.shape
+        cells = (positions // self.cell_size).astype(np.int64)
+        lx = cells[:, 0] - self.origin[0]
+        ly = cells[:, 1] - self.origin[1]
+        inside = (lx >= 0) & (lx < cols) & (ly >= 0) & (ly < rows)
+        lx = np.clip(lx, 0, max(cols - 1, 0))
+        ly = np.clip(ly, 0, max(rows - 1, 0))
+        if not inside.any():
+            return np.zeros_like(positions), inside
+
+        steps = self.next_step[lx, ly]
+        targets = (np.column_stack((lx + self.origin[0], ly + self.origin[1])) + steps + 0.5) * self.cell_size
+        vectors = targets - positions
+        length = np.hypot(vectors[:, 0], vectors[:, 1])
+        found = inside & self.has_step[lx, ly] & (length > 0)
+        directions = np.where(found[:, None], vectors / np.maximum(length, 1e-9)[:, None], 0)
+        return directions, found
+
+
+class Navigation:
+    def __init__(self, game_map, cell_size=NAV_CELL_SIZE):
+        self.cell_size = cell_size
+        self.free = ~game_map.occupancy_grid(cell_size)
+        vision_range = ENEMY_CONFIG.get("vision_range", 700)
+        self.max_distance = 2 * vision_range // cell_size
+        self.fields = {}
+
+        # по диагонали можно шагнуть, только если обе соседние клетки свободны; общая для всех полей
+        free = self.free
+        self.can_enter = {
+            (dx, dy): free & shifted(free, dx, 0) & shifted(free, 0, dy) if dx and dy else free
+            for dx, dy in STEPS
+        }
+
+    def update(self, players):
+        # поле помечается устаревшим, когда игрок сменил клетку, и пересчитывается при первом запросе
+        self.fields = {
+            player: self.fields.get(player) or FlowField(self.free, self.can_enter, self.cell_size,
+                                                         self.max_distance)
+            for player in players
+        }
+        for player, field in self.fields.items():
+            field.update(player.rect.center)
+
+    def directions_to(self, player, positions):
+        field = self.fields.get(player)
+        if field is None:
+            return np.zeros_like(positions), np.zeros(len(positions), dtype=bool)
+        return field.directions_at(positions)
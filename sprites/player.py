@@ -1,6 +1,10 @@
 import pygame as py
 from config import CONSTANTS
 from sprites.weapons import Weapon
+from sprites.render_queue import interpolate
+from asset_manager import AssetManager
+from game_clock import GameClock
+from font_manager import FontManager
 
 class Player:
     def __init__(self, x, y, gender, controls='wasd', name=""):
@@ -11,11 +15,17 @@ class Player:
         self.controls = controls
         self.name = name
         self.rect = py.Rect(x, y, 40, 40)
+        # центр на прошлом шаге симуляции, для плавной отрисовки между шагами
+        self.previous_center = self.rect.center
         self.facing_angle = 0
         self.inventory_limit = stats["inventory_limit"]
 
         self.dx = 0
         self.dy = 0
+        # нормаль стены, в которую упёрлись на последнем шаге; (0, 0) - свободно
+        self.contact_normal = (0, 0)
+        # откуда брать нажатые клавиши; None - клавиатура pygame
+        self.input_source = None
 
         self.weapon = Weapon(x, y, "fist")
         self.inventory = [Weapon(self.rect.x, self.rect.y, "fist")]
@@ -28,23 +38,25 @@ class Player:
         self.last_dropped_weapon_time = 0
         self.drop_cooldown_ms = 800
 
-        self.sprite_sheet = py.image.load(stats["image"]).convert_alpha()
+        assets = AssetManager.get_instance()
+        self.sprite_sheet = assets.get_image(stats["image"])
         self.current_frame = 0
         self.animation_speed = 0.2
         self.animation_timer = 0
-        self.frames = self.load_frames(self.sprite_sheet)
-        self.frames = [py.transform.scale(frame, (frame.get_width() * 2, frame.get_height() * 2)) for frame in
-                       self.frames]
+        self.frames = assets.get_frames(stats["image"], 24, 24, scale=2)
 
-    def pickup_weapon(self, weapons):
-        now = py.time.get_ticks()
-        for weapon in weapons[:]:
+    def pickup_weapon(self, weapons, weapon_index=None):
+        now = GameClock.get_instance().get_ticks()
+        nearby = weapon_index.query_rect(self.rect) if weapon_index is not None else weapons[:]
+        for weapon in nearby:
             if self.rect.colliderect(weapon.rect):
                 if now - self.last_dropped_weapon_time < self.drop_cooldown_ms:
                     continue
 
                 if len(self.inventory) < self.inventory_limit:
                     weapons.remove(weapon)
+                    if weapon_index is not None:
+                        weapon_index.remove(weapon)
 
                     if len(self.inventory) == 1 and self.inventory[0].weapon_type == "fist":
                         self.inventory.pop(0)
@@ -62,7 +74,7 @@ class Player:
     def update(self):
         self.weapon = self.get_current_weapon()
         if self.stunned:
-            now = py.time.get_ticks()
+            now = GameClock.get_instance().get_ticks()
             if now >= self.stun_end_time:
                 self.stunned = False
 
@@ -78,12 +90,10 @@ class Player:
             self.weapon.rect.center = self.rect.center
             self.weapon.update()
 
-    def attack(self, targets, bullets_group, effects_list=None):
-        if self.stunned:
-            return
-
-        if self.weapon:
-            self.weapon.attack(self, targets, bullets_group, effects_list)
+    def attack(self, targets, bullets_group, add_effect=None, target_index=None):
+        if self.stunned or not self.weapon:
+            return False
+        return self.weapon.attack(self, targets, bullets_group, add_effect, target_index)
 
     def get_current_weapon(self):
         if self.inventory:
@@ -94,7 +104,7 @@ class Player:
         if getattr(self, "stunned", False):
             return
 
-        keys = py.key.get_pressed()
+        keys = self.input_source() if self.input_source else py.key.get_pressed()
         dx = dy = 0
 
         if self.controls == 'wasd':
@@ -115,15 +125,24 @@ class Player:
             direction = py.Vector2(dx, -dy)
             self.facing_angle = direction.angle_to(py.Vector2(1, 0))
 
-    def draw(self, surface):
+    def render_rect(self, alpha=1.0):
+        rect = self.rect.copy()
+        rect.center = interpolate(self.previous_center, self.rect.center, alpha)
+        return rect
+
+    def queue_draw(self, render_queue, alpha=1.0):
+        # кадр и оружие в руках сортируются по одной глубине, чтобы оружие было поверх
+        rect = self.render_rect(alpha)
+        depth = rect.bottom
         frame = self.frames[self.current_frame]
-        rotated_frame = py.transform.rotate(frame, -self.facing_angle)
-        frame_rect = rotated_frame.get_rect(center=self.rect.center)
-        surface.blit(rotated_frame, frame_rect.topleft)
+        assets = AssetManager.get_instance()
+        rotated_frame = assets.get_rotated(frame, -self.facing_angle)
+        frame_rect = rotated_frame.get_rect(center=rect.center)
+        render_queue.add("players", rotated_frame, frame_rect.topleft, depth)
 
-        font = py.font.SysFont(None, 20)
-        name_text = font.render(f"{self.name} - HP: {self.health}", True, (255, 255, 255))
-        surface.blit(name_text, (self.rect.x, self.rect.y - 30))
+        fonts = FontManager.get_instance()
+        render_queue.extend("player_labels", fonts.layout_number(
+            (rect.x, rect.y - 30), f"{self.name} - HP: ", self.health))
 
         weapon_name = "Без оружия"
         if self.weapon:
@@ -131,23 +150,25 @@ class Player:
             if weapon_data:
                 weapon_name = weapon_data.get("name", self.weapon.weapon_type)
 
-        weapon_text = font.render(weapon_name, True, (255, 255, 0))
-        surface.blit(weapon_text, (self.rect.x, self.rect.y - 15))
+        weapon_text = fonts.render(weapon_name, 20, (255, 255, 0))
+        render_queue.add("player_labels", weapon_text, (rect.x, rect.y - 15))
 
         weapon = self.get_current_weapon()
         if weapon:
             weapon_image = weapon.image
-            rotated_image = py.transform.rotate(weapon_image, -self.facing_angle)
-            weapon_rect = rotated_image.get_rect(center=self.rect.center)
-            surface.blit(rotated_image, weapon_rect.topleft)
+            rotated_image = assets.get_rotated(weapon_image, -self.facing_angle)
+            weapon_rect = rotated_image.get_rect(center=rect.center)
+            render_queue.add("players", rotated_image, weapon_rect.topleft, depth)
 
-    def drop_weapon(self, weapons_on_map):
+    def drop_weapon(self, weapons_on_map, weapon_index=None):
         weapon = self.get_current_weapon()
         if not weapon or weapon.weapon_type == "fist":
             return
 
         dropped_weapon = Weapon(self.rect.centerx, self.rect.centery, weapon.weapon_type)
         weapons_on_map.append(dropped_weapon)
+        if weapon_index is not None:
+            weapon_index.insert(dropped_weapon)
         self.inventory.pop(self.current_weapon_index)
 
         if self.inventory:
@@ -157,12 +178,4 @@ class Player:
             self.current_weapon_index = 0
 
         self.weapon = self.inventory[self.current_weapon_index]
-        self.last_dropped_weapon_time = py.time.get_ticks()
-
-    def load_frames(self, sheet, frame_width=24, frame_height=24):
-        frames = []
-        sheet_width, sheet_height = sheet.get_size()
-        for i in range(sheet_width // frame_width):
-            rect = py.Rect(i * frame_width, 0, frame_width, frame_height)
-            frames.append(sheet.subsurface(rect))
-        return frames
\ No newline at end of file
+        self.last_dropped_weapon_time = GameClock.get_instance().get_ticks()
@@ -1,39 +1,106 @@
 import pygame as py
 import math
 from config import CONSTANTS
+from asset_manager import AssetManager
+from game_clock import GameClock
+from audio_manager import emit_sound
 
 
 class Bullet(py.sprite.Sprite):
+    # одна картинка на каждый вид дроби, общая для всех пуль
+    images = {}
+
+    @classmethod
+    def image_for(cls, size, color):
+        key = (tuple(size), tuple(color))
+        if key not in cls.images:
+            image = py.Surface(size)
+            image.fill(color)
+            cls.images[key] = image
+        return cls.images[key]
+
     def __init__(self, start_pos, angle, damage, owner, params={}):
         super().__init__()
+        self.pool = None
+        self.reset(start_pos, angle, damage, owner, params)
+
+    def reset(self, start_pos, angle, damage, owner, params={}):
         size = params.get("size", [5, 5])
         color = params.get("color", [255, 255, 0])
 
-        self.image = py.Surface(size)
-        self.image.fill(color)
+        self.image = Bullet.image_for(size, color)
         self.rect = self.image.get_rect(center=start_pos)
+        self.previous_center = self.rect.center
+        # пуля из пула для снимков сети - новый объект, id выдаётся заново
+        self.net_id = None
 
         self.angle = angle
         self.speed = params.get("speed", 10)
         self.damage = damage
         self.owner = owner
+        self.spawn_time = GameClock.get_instance().get_ticks()
+        self.lifetime = params.get("lifetime", 2000)
 
         rad = math.radians(self.angle)
         self.dx = self.speed * math.cos(rad)
         self.dy = self.speed * math.sin(rad)
 
     def update(self):
+        self.previous_center = self.rect.center
         self.rect.x += self.dx
         self.rect.y += self.dy
 
+    def expired(self, now):
+        return now - self.spawn_time >= self.lifetime
+
+    def kill(self):
+        was_alive = self.alive()
+        super().kill()
+        if was_alive and self.pool is not None:
+            self.pool.free_bullets.append(self)
+
     def check_collision(self, targets):
         for target in targets:
             if target != self.owner and self.rect.colliderect(target.rect):
                 target.health -= self.damage
+                emit_sound("pellet_hit", self.rect.center)
                 self.kill()
                 break
 
 
+class ProjectilePool(py.sprite.Group):
+    # пули переиспользуются и снимаются, когда вылетели за карту, в стену или по времени
+    def __init__(self, game_map=None):
+        super().__init__()
+        self.game_map = game_map
+        self.free_bullets = []
+
+    def fire(self, start_pos, angle, damage, owner, params={}):
+        if self.free_bullets:
+            bullet = self.free_bullets.pop()
+            bullet.reset(start_pos, angle, damage, owner, params)
+        else:
+            bullet = Bullet(start_pos, angle, damage, owner, params)
+            bullet.pool = self
+        self.add(bullet)
+        return bullet
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        now = GameClock.get_instance().get_ticks()
+        bullets = [bullet for bullet in self.sprites() if isinstance(bullet, Bullet)]
+        if not bullets:
+            return
+        # стены и края карты проверяются одним запросом к маске для всех пуль
+        if self.game_map is not None:
+            walkable = self.game_map.are_walkable([bullet.rect.center for bullet in bullets])
+        else:
+            walkable = [True] * len(bullets)
+        for bullet, inside in zip(bullets, walkable):
+            if bullet.expired(now) or not inside:
+                bullet.kill()
+
+
 class MolotovEffect:
     def __init__(self, position, params={}, explosion_image=None):
         self.position = position
@@ -44,7 +111,7 @@ class MolotovEffect:
         self.explosion_damage = params.get("explosion_damage", 5)
         self.burn_damage = params.get("burn_damage", 1)
 
-        self.explosion_time = py.time.get_ticks() + self.explosion_delay
+        self.explosion_time = GameClock.get_instance().get_ticks() + self.explosion_delay
         self.end_time = self.explosion_time + self.fire_duration
         self.state = 'waiting'
         self.last_burn_time = 0
@@ -52,16 +119,15 @@ class MolotovEffect:
 
         # Загрузка изображения взрыва
         if explosion_image:
-            self.explosion_image = py.image.load(explosion_image).convert_alpha()
-            self.explosion_image = py.transform.scale(
-                self.explosion_image,
+            self.explosion_image = AssetManager.get_instance().get_image(
+                explosion_image,
                 (self.radius * 2, self.radius * 2)
             )
         else:
             self.explosion_image = None
 
     def update(self, targets):
-        now = py.time.get_ticks()
+        now = GameClock.get_instance().get_ticks()
 
         if self.state == 'waiting' and now >= self.explosion_time:
             self.state = 'active'
@@ -73,6 +139,7 @@ class MolotovEffect:
                 if dx * dx + dy * dy <= self.radius * self.radius:
                     target.health -= self.explosion_damage
             self.exploded = True
+            emit_sound("explosion", self.position)
 
         if self.state == 'active':
             if now >= self.end_time:
@@ -85,39 +152,37 @@ class MolotovEffect:
                     dy = target.rect.centery - self.position[1]
                     if dx * dx + dy * dy <= self.radius * self.radius:
                         target.health -= self.burn_damage
+                emit_sound("burn", self.position)
                 self.last_burn_time = now
 
-    def draw(self, surface, scale_func=None):
-        pos = self.position
-        if scale_func:
-            pos = scale_func(self.position)
-
+    def current_image(self):
         if self.state == 'waiting':
             if not hasattr(self, 'molotov_image'):
                 # Загрузка изображения молотова из конфига
                 weapon_data = CONSTANTS["weapons"]["stats"].get("molotov", {})
                 image_path = weapon_data.get("image", "assets/images/weapon/molotov.png")
 
-                original_image = py.image.load(image_path).convert_alpha()
-                self.molotov_image = py.transform.smoothscale(original_image, (30, 30))
-
-            rect = self.molotov_image.get_rect(center=pos)
-            surface.blit(self.molotov_image, rect)
+                self.molotov_image = AssetManager.get_instance().get_image(image_path, (30, 30), "smoothscale")
+            return self.molotov_image
 
-        elif self.state == 'active':
+        if self.state == 'active':
             if self.explosion_image:
-                rect = self.explosion_image.get_rect(center=pos)
-                surface.blit(self.explosion_image, rect)
-            else:
-                radius_scaled = self.radius
-                if scale_func:
-                    sx = scale_func((self.position[0] + self.radius, self.position[1]))[0] - pos[0]
-                    sy = scale_func((self.position[0], self.position[1] + self.radius))[1] - pos[1]
-                    radius_scaled = int((sx + sy) / 2)
+                return self.explosion_image
+            if not hasattr(self, 'fire_image'):
+                self.fire_image = self.circle_image(self.radius)
+            return self.fire_image
+        return None
+
+    @staticmethod
+    def circle_image(radius):
+        s = py.Surface((radius * 2, radius * 2), py.SRCALPHA)
+        py.draw.circle(s, (255, 0, 0, 100), (radius, radius), radius)
+        return s
 
-                s = py.Surface((radius_scaled * 2, radius_scaled * 2), py.SRCALPHA)
-                py.draw.circle(s, (255, 0, 0, 100), (radius_scaled, radius_scaled), radius_scaled)
-                surface.blit(s, (pos[0] - radius_scaled, pos[1] - radius_scaled))
+    def queue_draw(self, render_queue):
+        image = self.current_image()
+        if image:
+            render_queue.add("effects", image, image.get_rect(center=self.position).topleft)
 
 
 class Boomerang(py.sprite.Sprite):
@@ -127,13 +192,13 @@ class Boomerang(py.sprite.Sprite):
         image_path = weapon_data.get("image", "assets/images/weapon/boomerang.png")
 
         size = params.get("size", [35, 35])
-        image = py.image.load(image_path).convert_alpha()
-        self.image = py.transform.scale(image, size)
+        self.image = AssetManager.get_instance().get_image(image_path, size)
         self.rect = self.image.get_rect(center=start_pos)
+        self.previous_center = self.rect.center
 
         self.owner = owner
         self.damage = damage
-        self.spawn_time = py.time.get_ticks()
+        self.spawn_time = GameClock.get_instance().get_ticks()
         self.max_time = params.get("max_time", 1500)
         self.angle = owner.facing_angle
         self.center_x, self.center_y = start_pos
@@ -147,7 +212,8 @@ class Boomerang(py.sprite.Sprite):
         self.hit_interval = params.get("hit_interval", 100)
 
     def update(self):
-        now = py.time.get_ticks()
+        self.previous_center = self.rect.center
+        now = GameClock.get_instance().get_ticks()
         elapsed = now - self.spawn_time
 
         if not self.returning:
@@ -187,30 +253,32 @@ class Boomerang(py.sprite.Sprite):
             self.rect.centery += move_y
 
     def check_collision(self, targets):
-        now = py.time.get_ticks()
+        now = GameClock.get_instance().get_ticks()
         for target in targets:
             if target != self.owner and self.rect.colliderect(target.rect):
                 last_hit = self.last_hit_times.get(target, 0)
                 if now - last_hit >= self.hit_interval:
                     target.health -= self.damage
+                    emit_sound("hit", target.rect.center)
                     self.last_hit_times[target] = now
 
 
 class Yoyo(py.sprite.Sprite):
-    def __init__(self, owner, damage, targets, params={}):
+    def __init__(self, owner, damage, targets, params={}, target_index=None):
         super().__init__()
         # Загрузка изображения из конфига
         weapon_data = CONSTANTS["weapons"]["stats"].get("yoyo", {})
         image_path = weapon_data.get("image", "assets/images/weapon/yoyo.png")
 
         size = params.get("size", [30, 30])
-        image = py.image.load(image_path).convert_alpha()
-        self.image = py.transform.scale(image, size)
+        self.image = AssetManager.get_instance().get_image(image_path, size)
         self.rect = self.image.get_rect(center=owner.rect.center)
+        self.previous_center = self.rect.center
 
         self.owner = owner
         self.damage = damage
         self.targets = targets
+        self.target_index = target_index
 
         self.speed = params.get("speed", 10)
         self.max_distance = params.get("max_distance", 200)
@@ -229,7 +297,8 @@ class Yoyo(py.sprite.Sprite):
         self.pull_speed = params.get("pull_speed", 30)
 
     def update(self):
-        now = py.time.get_ticks()
+        self.previous_center = self.rect.center
+        now = GameClock.get_instance().get_ticks()
 
         if self.state == "outgoing":
             self.position += self.direction * self.speed
@@ -238,11 +307,14 @@ class Yoyo(py.sprite.Sprite):
             if self.position.distance_to(self.origin) >= self.max_distance:
                 self.state = "returning"
 
-            for target in self.targets:
+            # через индекс берутся актуальные цели, а не список на момент броска
+            nearby = self.target_index.query_rect(self.rect) if self.target_index is not None else self.targets
+            for target in nearby:
                 if target == self.owner or getattr(target, "health", None) is None or target.health <= 0:
                     continue
                 if self.rect.colliderect(target.rect):
                     target.health -= self.damage
+                    emit_sound("hit", target.rect.center)
                     target.stunned = True
                     if hasattr(target, 'stun_timer'):
                         target.stun_timer = now + self.stun_duration
@@ -254,7 +326,7 @@ class Yoyo(py.sprite.Sprite):
                     pull_vector = owner_pos - target_pos
                     if pull_vector.length() > 0:
                         pull_vector = pull_vector.normalize() * self.pull_speed
-                        target.rect.center += pull_vector
+                        target.rect = target.rect.move(pull_vector)
 
                     self.stuck_target = target
                     self.stun_end_time = now + self.stun_duration
@@ -0,0 +1,42 @@
+from operator import itemgetter
+
+# порядок слоёв совпадает с прежним порядком отрисовки сцены
+LAYERS = ("weapons", "projectiles", "enemies", "enemy_labels", "effects", "players", "player_labels")
+
+
+def interpolate(previous, current, alpha):
+    # положение между двумя шагами симуляции, alpha = 0 .. 1
+    return (round(previous[0] + (current[0] - previous[0]) * alpha),
+            round(previous[1] + (current[1] - previous[1]) * alpha))
+
+
+class RenderQueue:
+    def __init__(self):
+        self.layers = {layer: [] for layer in LAYERS}
+
+    def clear(self):
+        for items in self.layers.values():
+            items.clear()
+
+    def add(self, layer, image, pos, depth=None):
+        # pos в мировых координатах; внутри слоя рисуем сверху вниз по depth
+        if depth is None:
+            depth = pos[1] + image.get_height()
+        self.layers[layer].append((depth, image, pos[0], pos[1]))
+
+    def extend(self, layer, blits):
+        for image, pos in blits:
+            self.add(layer, image, pos)
+
+    def submit(self, surface, camera_offset=(0, 0)):
+        ox, oy = camera_offset
+        for layer in LAYERS:
+            items = self.layers[layer]
+            if not items:
+                continue
+            items.sort(key=itemgetter(0))
+            batch = [(image, (int(x - ox), int(y - oy))) for _, image, x, y in items]
+            if hasattr(surface, "fblits"):
+                surface.fblits(batch)
+            else:
+                surface.blits(batch, False)
@@ -0,0 +1,86 @@
+import pygame as py
+from collections import defaultdict
+
+
+class SpatialHash:
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = defaultdict(set)
+        self.entries = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, obj):
+        return obj in self.entries
+
+    def __iter__(self):
+        return iter(list(self.entries))
+
+    def cell_range(self, rect):
+        size = self.cell_size
+        return rect.left // size, rect.top // size, (rect.right - 1) // size, (rect.bottom - 1) // size
+
+    def cells_in(self, cell_range):
+        x0, y0, x1, y1 = cell_range
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                yield cx, cy
+
+    def insert(self, obj):
+        self.update(obj)
+
+    def update(self, obj):
+        # ячейки пересчитываются, только если объект из них вышел
+        new_range = self.cell_range(obj.rect)
+        old_range = self.entries.get(obj)
+        if new_range == old_range:
+            return
+        if old_range is not None:
+            self.unlink(obj, old_range)
+        for cell in self.cells_in(new_range):
+            self.cells[cell].add(obj)
+        self.entries[obj] = new_range
+
+    def remove(self, obj):
+        old_range = self.entries.pop(obj, None)
+        if old_range is not None:
+            self.unlink(obj, old_range)
+
+    def unlink(self, obj, cell_range):
+        for cell in self.cells_in(cell_range):
+            bucket = self.cells.get(cell)
+            if bucket is not None:
+                bucket.discard(obj)
+                if not bucket:
+                    del self.cells[cell]
+
+    def sync(self, objects):
+        # обновить всех живых и выкинуть тех, кого больше нет в списке
+        alive = set()
+        for obj in objects:
+            self.update(obj)
+            alive.add(obj)
+        for obj in [o for o in self.entries if o not in alive]:
+            self.remove(obj)
+
+    def clear(self):
+        self.cells.clear()
+        self.entries.clear()
+
+    def query_rect(self, rect):
+        rect = py.Rect(rect)
+        found = set()
+        for cell in self.cells_in(self.cell_range(rect)):
+            bucket = self.cells.get(cell)
+            if bucket:
+                found |= bucket
+        return [obj for obj in found if rect.colliderect(obj.rect)]
+
+    def query_radius(self, center, radius):
+        cx, cy = center
+        area = py.Rect(cx - radius, cy - radius, radius * 2 + 1, radius * 2 + 1)
+        return [
+            obj for obj in self.query_rect(area)
+            if (obj.rect.centerx - cx) ** 2 + (obj.rect.centery - cy) ** 2 <= radius * radius
+        ]
@@ -0,0 +1,50 @@
+import math
+import random
+
+
+class PoissonDiskSampler:
+    # точки не ближе radius друг к другу; сетка с клеткой radius / sqrt(2) хранит не больше одной точки
+    def __init__(self, radius, accept=None, attempts=30, rng=random):
+        self.radius = radius
+        self.cell_size = radius / math.sqrt(2)
+        self.accept = accept
+        self.attempts = attempts
+        self.rng = rng
+        self.grid = {}
+        self.points = []
+
+    def cell_of(self, point):
+        return int(point[0] // self.cell_size), int(point[1] // self.cell_size)
+
+    def far_enough(self, point):
+        cx, cy = self.cell_of(point)
+        radius_sq = self.radius * self.radius
+        for nx in range(cx - 2, cx + 3):
+            for ny in range(cy - 2, cy + 3):
+                other = self.grid.get((nx, ny))
+                if other is not None and (other[0] - point[0]) ** 2 + (other[1] - point[1]) ** 2 < radius_sq:
+                    return False
+        return True
+
+    def add(self, point):
+        self.grid[self.cell_of(point)] = point
+        self.points.append(point)
+
+    def try_add(self, point):
+        if point is None or not self.far_enough(point):
+            return False
+        if self.accept is not None and not self.accept(point):
+            return False
+        self.add(point)
+        return True
+
+    def sample(self, count, candidate):
+        # не больше attempts кандидатов на каждую точку: стоимость не зависит от удачи
+        placed = []
+        budget = count * self.attempts
+        while len(placed) < count and budget > 0:
+            budget -= 1
+            point = candidate()
+            if self.try_add(point):
+                placed.append(point)
+        return placed
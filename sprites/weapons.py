@@ -1,7 +1,10 @@
 import pygame as py
 import math
 from config import CONSTANTS
-from sprites.projectiles import Bullet, MolotovEffect, Boomerang, Yoyo
+from sprites.projectiles import MolotovEffect, Boomerang, Yoyo
+from asset_manager import AssetManager
+from game_clock import GameClock
+from audio_manager import emit_sound
 
 
 class Weapon(py.sprite.Sprite):
@@ -18,7 +21,7 @@ class Weapon(py.sprite.Sprite):
         self.image = self.create_image(weapon_type, weapon_data)
         self.rect = self.image.get_rect(center=(x, y))
         self.cooldown = weapon_data.get("cooldown", 500)
-        self.last_attack_time = py.time.get_ticks()
+        self.last_attack_time = GameClock.get_instance().get_ticks()
         self.damage = weapon_data.get("damage", 1)
 
     def create_image(self, weapon_type, weapon_data):
@@ -26,28 +29,22 @@ class Weapon(py.sprite.Sprite):
         size = weapon_data.get("size", (42, 42))
 
         if image_path:
-            image = py.image.load(image_path).convert_alpha()
-            return py.transform.scale(image, size)
-        if weapon_type == "fist":
-            image = py.Surface(size, py.SRCALPHA)
-            image.fill((0, 0, 0, 0))
-            return image
-
-        image = py.Surface(size, py.SRCALPHA)
-        return image
+            return AssetManager.get_instance().get_image(image_path, size)
+        return AssetManager.get_instance().get_blank(size)
 
     def draw_on_map(self, surface, pos=None):
         if pos is None:
             pos = self.rect.topleft
         surface.blit(self.image, pos)
 
-    def attack(self, player, targets, bullets_group, effects_list=None):
-        now = py.time.get_ticks()
+    def attack(self, player, targets, bullets_group, add_effect=None, target_index=None):
+        # True, если удар или бросок действительно состоялся
+        now = GameClock.get_instance().get_ticks()
         if now - self.last_attack_time < self.cooldown:
-            return
+            return False
 
         if self.weapon_type == "yoyo" and getattr(player, "weapon_in_use", False):
-            return
+            return False
 
         self.last_attack_time = now
         weapon_data = CONSTANTS["weapons"]["stats"].get(self.weapon_type, {})
@@ -55,27 +52,28 @@ class Weapon(py.sprite.Sprite):
 
         if self.weapon_type == "shotgun":
             spread_angles = projectile_params.get("spread_angles", [-20, -7, 7, 20])
+            emit_sound("shotgun", player.rect.center)
             for angle_offset in spread_angles:
                 bullet_angle = player.facing_angle + angle_offset
-                bullet = Bullet(
+                bullets_group.fire(
                     player.rect.center,
                     bullet_angle,
                     self.damage,
                     owner=player,
                     params=projectile_params
                 )
-                bullets_group.add(bullet)
 
         elif self.weapon_type == "boomerang":
-            if player.active_boomerang is None:
-                boomerang = Boomerang(
-                    player.rect.center,
-                    owner=player,
-                    damage=self.damage,
-                    params=projectile_params
-                )
-                bullets_group.add(boomerang)
-                player.active_boomerang = boomerang
+            if player.active_boomerang is not None:
+                return False
+            boomerang = Boomerang(
+                player.rect.center,
+                owner=player,
+                damage=self.damage,
+                params=projectile_params
+            )
+            bullets_group.add(boomerang)
+            player.active_boomerang = boomerang
 
         elif self.weapon_type == "molotov":
             effect = MolotovEffect(
@@ -83,18 +81,20 @@ class Weapon(py.sprite.Sprite):
                 params=projectile_params,
                 explosion_image=weapon_data.get("explosion")
             )
-            effects_list.append(effect)
+            add_effect(effect)
 
         elif self.weapon_type == "yoyo":
-            if getattr(player, "active_yoyo", None) is None:
-                yoyo = Yoyo(
-                    owner=player,
-                    damage=self.damage,
-                    targets=targets,
-                    params=projectile_params
-                )
-                bullets_group.add(yoyo)
-                player.active_yoyo = yoyo
+            if getattr(player, "active_yoyo", None) is not None:
+                return False
+            yoyo = Yoyo(
+                owner=player,
+                damage=self.damage,
+                targets=targets,
+                params=projectile_params,
+                target_index=target_index
+            )
+            bullets_group.add(yoyo)
+            player.active_yoyo = yoyo
 
         else:
             attack_rect = player.rect.copy()
@@ -103,6 +103,11 @@ class Weapon(py.sprite.Sprite):
             attack_rect.x += int(math.cos(angle_rad) * offset)
             attack_rect.y -= int(math.sin(angle_rad) * offset)
 
-            for target in targets:
+            nearby = target_index.query_rect(attack_rect) if target_index is not None else targets
+            for target in nearby:
+                if target is player:
+                    continue
                 if attack_rect.colliderect(target.rect):
-                    target.health -= self.damage
\ No newline at end of file
+                    target.health -= self.damage
+                    emit_sound("hit", target.rect.center)
+        return True
\ No newline at end of file
@@ -1,13 +1,13 @@
 import pygame
 from scene_manager import SceneManager
 from audio_manager import AudioManager
+from font_manager import FontManager
 
 class Button:
     def __init__(self, rect, text, callback):
         self.rect = pygame.Rect(rect)
         self.text = text
         self.callback = callback
-        self.font = pygame.font.SysFont("Comic Sans MS", 42)
         self.hover = False
 
     def set_position(self, rect):
@@ -20,7 +20,7 @@ class Button:
         color = hover_color if self.hover else base_color
         pygame.draw.rect(surface, color, self.rect, border_radius=12)
         pygame.draw.rect(surface, border_color, self.rect, 3, border_radius=12)
-        text_surf = self.font.render(self.text, True, (0, 0, 0))
+        text_surf = FontManager.get_instance().render(self.text, 42, (0, 0, 0), "Comic Sans MS")
         surface.blit(
             text_surf,
             (
@@ -40,7 +40,6 @@ class Button:
 
 class CharacterSelect:
     def __init__(self, default_next="level1"):
-        self.font = pygame.font.SysFont("Comic Sans MS", 40)
         self.player1_choice = None
         self.player2_choice = None
         self.current_player = 1
@@ -74,7 +73,7 @@ class CharacterSelect:
             self.load_level()
 
     def load_level(self):
-        scene = SceneManager.get_instance().scenes[self.next_level_id]
+        scene = SceneManager.get_instance().get(self.next_level_id)
         scene.set_player_choices(self.player1_choice, self.player2_choice)
         SceneManager.get_instance().set_scene(self.next_level_id)
 
@@ -83,6 +82,7 @@ class CharacterSelect:
         self.player2_choice = None
         self.current_player = 1
         self.make_buttons()
+        SceneManager.get_instance().preload(self.next_level_id)
         AudioManager.get_instance().play_music(AudioManager.get_instance().tracks["ambient"])
 
     def update_layout(self, window_size):
@@ -99,18 +99,18 @@ class CharacterSelect:
     def render(self, screen):
         screen.fill((30, 30, 30))
         prompt = f"Игрок {self.current_player}, выбери своего бойца:"
-        text = self.font.render(prompt, True, (255, 255, 255))
+        fonts = FontManager.get_instance()
+        text = fonts.render(prompt, 40, (255, 255, 255), "Comic Sans MS")
         screen.blit(text, (screen.get_width() // 2 - text.get_width() // 2, 100))
 
         for button in self.buttons:
             button.draw(screen)
-        desc_font = pygame.font.SysFont("Comic Sans MS", 28)
 
         woman_text = "Женщина: 75 хп, быстрее, может носить 2 оружия"
         man_text = "Мужчина: 100 хп, медленный, может носить 3 оружия"
 
-        woman_surf = desc_font.render(woman_text, True, (200, 200, 200))
-        man_surf = desc_font.render(man_text, True, (200, 200, 200))
+        woman_surf = fonts.render(woman_text, 28, (200, 200, 200), "Comic Sans MS")
+        man_surf = fonts.render(man_text, 28, (200, 200, 200), "Comic Sans MS")
 
         last_button = self.buttons[-1]
         base_y = last_button.rect.bottom + 40
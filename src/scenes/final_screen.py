@@ -2,6 +2,7 @@ import pygame
 from src.scenes.menu import Button
 from scene_manager import SceneManager
 from audio_manager import AudioManager
+from font_manager import FontManager
 
 class WinScene:
     def __init__(self, winner_index, level_scene_name="level", menu_scene_name="main_menu"):
@@ -43,8 +44,8 @@ class WinScene:
     def render(self, screen):
         screen.fill((30, 30, 30))
 
-        font = pygame.font.SysFont("Comic Sans MS", 64)
-        win_text = font.render(f"Игрок {self.winner_index + 1} выжил... остался только один", True, (255, 255, 255))
+        win_text = FontManager.get_instance().render(
+            f"Игрок {self.winner_index + 1} выжил... остался только один", 64, (255, 255, 255), "Comic Sans MS")
         text_rect = win_text.get_rect(center=(self.window_size[0] // 2, self.window_size[1] // 2 - 100))
         screen.blit(win_text, text_rect)
 
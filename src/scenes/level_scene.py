@@ -1,26 +1,62 @@
 import pygame as py
+import numpy as np
 import random
 import json
 import os
+import logging
 
 from sprites.player import Player
-from sprites.enemies import Enemy
+from sprites.enemies import EnemySwarm
 from sprites.weapons import Weapon
 from sprites.map import Map
-from sprites.projectiles import MolotovEffect
+from sprites.movement import move_rect
+from sprites.level_bundle import load_level_bundle
+from sprites.line_of_sight import LineOfSight
+from sprites.navigation import Navigation
+from sprites.spatial_hash import SpatialHash
+from sprites.projectiles import ProjectilePool
+from sprites.render_queue import RenderQueue, interpolate
+from sprites.spawn_sampler import PoissonDiskSampler
+from sprites.entity_registry import EntityRegistry
+from sprites.ai_scheduler import AIScheduler
+from game_clock import GameClock
 from config import CONSTANTS, LEVELS_DIR
 from audio_manager import AudioManager
+from frame_profiler import FrameProfiler
+
 ENEMY_CONFIG = CONSTANTS["enemy"]
+RENDER_MARGIN = 64
+WEAPON_SPAWN_SIZE = 32
+WEAPON_SPACING = 120
+ENEMY_GUARD_RANGE = 80
+
+logger = logging.getLogger(__name__)
 
 
 class LevelScene:
-    def __init__(self, level_id):
+    def __init__(self, level_id, headless=False):
         self.level_id = level_id
+        # без окна и звука: сцену гоняет headless.py
+        self.headless = headless
+        self.winner_index = None
         self.players = []
-        self.enemies = []
+        self.enemies = EnemySwarm()
+        self.ai_scheduler = AIScheduler()
         self.weapons = []
-        self.effects = []
-        self.bullets = py.sprite.Group()
+        # сущности уровня: у игроков и врагов есть компонент target, у эффектов - effect
+        self.registry = EntityRegistry()
+        self.targets = self.registry.store("target")
+        self.effects = self.registry.store("effect")
+        self.bullets = ProjectilePool()
+        # пространственные индексы: враги и игроки, оружие на карте, снаряды
+        self.target_index = SpatialHash()
+        self.weapon_index = SpatialHash()
+        self.projectile_index = SpatialHash()
+        # отрисовка: очередь спрайтов и переиспользуемые поверхности половин экрана
+        self.render_queue = RenderQueue()
+        self.view_surfaces = None
+        # доля шага симуляции, прошедшая с последнего update; выставляет SceneManager
+        self.render_alpha = 1.0
         self.level_data = {}
         self.load_level_data()
         self.finished = False
@@ -30,24 +66,33 @@ class LevelScene:
         self.scale_x = 1
         self.scale_y = 1
 
-        self.playing_track = AudioManager.get_instance().play_random_level_music()
+        # музыка включается в on_enter: сцена может собираться в фоновом потоке
+        self.playing_track = None
 
         self.load_map()
 
     def load_level_data(self):
-        level_file = os.path.join(LEVELS_DIR, f"{self.level_id}.json")
-        with open(level_file, "r", encoding="utf-8") as f:
+        self.level_file = os.path.join(LEVELS_DIR, f"{self.level_id}.json")
+        with open(self.level_file, "r", encoding="utf-8") as f:
             self.level_data = json.load(f)
 
     def load_map(self):
-        self.map = Map(self.level_data["map"])
-
-    def is_point_inside_map(self, x, y):
-        return self.map.is_walkable(x, y)
+        # собранный уровень (compile_levels.py) избавляет от пересчёта маски из png
+        bundle = load_level_bundle(self.level_file, self.level_data["map"])
+        self.map = Map(self.level_data["map"], self.level_data.get("background_color", (40, 40, 40)), bundle,
+                       render=not self.headless)
+        self.line_of_sight = LineOfSight(self.map)
+        self.navigation = Navigation(self.map)
+        self.bullets.game_map = self.map
 
     def on_enter(self):
         self.finished = False
-        self.playing_track = AudioManager.get_instance().play_random_level_music()
+        # сцена могла собираться в фоновом потоке: тайлы карты строятся здесь, в главном
+        self.map.prepare_render()
+        if not self.headless:
+            audio = AudioManager.get_instance()
+            audio.listeners = self.players
+            self.playing_track = audio.play_random_level_music()
 
     def update_layout(self, window_size):
         self.window_size = window_size
@@ -70,68 +115,76 @@ class LevelScene:
     def spawn_weapons_and_enemies(self):
         self.weapons.clear()
         self.enemies.clear()
+        self.target_index.clear()
+        self.weapon_index.clear()
+        self.projectile_index.clear()
+        self.registry.clear()
+        for player in self.players:
+            player.entity_id = self.registry.create(target=player, player=player)
+            self.target_index.insert(player)
 
+        # оружие по карте и охрана вокруг него: пуассоновские выборки с ограниченным числом попыток
         num_weapons = random.randint(3, 20)
-        placed_positions = []
-
-        world_w, world_h = self.level_data["world_size"]
-
-        for _ in range(num_weapons):
-            import pygame as py
-            for _ in range(100):
-                x = random.randint(32, world_w - 32)
-                y = random.randint(32, world_h - 32)
-                new_rect = py.Rect(x, y, 32, 32)
-
-                if all(not new_rect.colliderect(py.Rect(px, py_, 32, 32).inflate(100, 100)) for px, py_ in
-                       placed_positions) and \
-                        all(not new_rect.colliderect(p.rect.inflate(100, 100)) for p in self.players):
-
-                    points_to_check = [
-                        (x + 16, y + 16), # центр
-                        (x, y), # верх лев
-                        (x + 31, y), # верх прав
-                        (x, y + 31), # ниж лев
-                        (x + 31, y + 31) # ниж прав
-                    ]
-
-                    if all(self.map.is_walkable(px, py) for px, py in points_to_check):
-                        placed_positions.append((x, y))
-                        weapon_type = random.choice([w for w in CONSTANTS["weapons"]["types"] if w != "fist"])
-                        weapon = Weapon(x, y, weapon_type=weapon_type)
-                        self.weapons.append(weapon)
-
-                        for _ in range(random.randint(1, 3)):
-                            max_enemy_attempts = 30
-                            for attempt in range(max_enemy_attempts):
-                                offset_x = random.randint(-80, 80)
-                                offset_y = random.randint(-80, 80)
-                                enemy_x = max(0, min(world_w - 40, x + offset_x))
-                                enemy_y = max(0, min(world_h - 40, y + offset_y))
-
-                                enemy_points = [
-                                    (enemy_x + 20, enemy_y + 20),
-                                    (enemy_x, enemy_y),
-                                    (enemy_x + 39, enemy_y),
-                                    (enemy_x, enemy_y + 39),
-                                    (enemy_x + 39, enemy_y + 39)
-                                ]
-                                if not all(self.map.is_walkable(px, py) for px, py in enemy_points):
-                                    continue
-
-                                temp_enemy = Enemy(self.weapons, self.players, pos=(enemy_x, enemy_y))
-                                overlaps = any(
-                                    temp_enemy.rect.colliderect(e.rect.inflate(-10, -10)) for e in self.enemies)
-                                too_close_to_players = any(
-                                    (temp_enemy.rect.centerx - p.rect.centerx) ** 2 + (
-                                                temp_enemy.rect.centery - p.rect.centery) ** 2 < ENEMY_CONFIG[
-                                        "min_spawn_distance"] ** 2
-                                    for p in self.players
-                                )
-                                if not overlaps and not too_close_to_players:
-                                    self.enemies.append(temp_enemy)
-                                    break
-                        break
+        weapon_types = [w for w in CONSTANTS["weapons"]["types"] if w != "fist"]
+        player_zones = [p.rect.inflate(100, 100) for p in self.players]
+
+        def weapon_fits(point):
+            rect = py.Rect(point[0], point[1], WEAPON_SPAWN_SIZE, WEAPON_SPAWN_SIZE)
+            return rect.collidelist(player_zones) == -1 and self.map.is_rect_walkable(rect)
+
+        weapon_sampler = PoissonDiskSampler(WEAPON_SPACING, weapon_fits)
+        for x, y in weapon_sampler.sample(num_weapons, self.map.random_spawn_point):
+            weapon = Weapon(x, y, weapon_type=random.choice(weapon_types))
+            self.weapons.append(weapon)
+            self.weapon_index.insert(weapon)
+
+        min_distance_sq = ENEMY_CONFIG["min_spawn_distance"] ** 2
+
+        def enemy_fits(center):
+            # кандидаты уже целиком на проходимом, остаётся не ставить врага рядом с игроком
+            return all((center[0] - p.rect.centerx) ** 2 + (center[1] - p.rect.centery) ** 2 >= min_distance_sq
+                       for p in self.players)
+
+        # центры врагов из заранее посчитанных точек появления под размер врага
+        enemy_size = self.enemies.rect_at((0, 0)).size
+        enemy_centers = self.map.spawn_points_for(enemy_size) + np.array(enemy_size) // 2
+        enemy_sampler = PoissonDiskSampler(max(enemy_size), enemy_fits)
+        num_enemies = 0
+        for weapon in self.weapons:
+            wanted = random.randint(1, 3)
+            num_enemies += wanted
+            # точки отсортированы по x: полоса по x берётся бинарным поиском, по y - маской
+            cx, cy = weapon.x + 20, weapon.y + 20
+            first, last = np.searchsorted(enemy_centers[:, 0], (cx - ENEMY_GUARD_RANGE, cx + ENEMY_GUARD_RANGE + 1))
+            band = enemy_centers[first:last]
+            guards = band[np.abs(band[:, 1] - cy) <= ENEMY_GUARD_RANGE]
+
+            def near_weapon(guards=guards):
+                if not len(guards):
+                    return None
+                x, y = guards[random.randrange(len(guards))]
+                return int(x), int(y)
+
+            for center in enemy_sampler.sample(wanted, near_weapon):
+                self.add_enemy(center)
+
+        if len(self.weapons) < num_weapons or len(self.enemies) < num_enemies:
+            logger.warning("%s: placed %d/%d weapons and %d/%d enemies", self.level_id,
+                           len(self.weapons), num_weapons, len(self.enemies), num_enemies)
+
+    def make_noise(self, player_index):
+        player = self.players[player_index]
+        self.ai_scheduler.noise(self.enemies, player.rect.center, ENEMY_CONFIG.get("noise_radius", 900),
+                                player_index, GameClock.get_instance().get_ticks())
+
+    def add_enemy(self, center):
+        enemy = self.enemies.spawn(center)
+        enemy.entity_id = self.registry.create(target=enemy, enemy=enemy)
+        self.target_index.insert(enemy)
+        return enemy
+
+    def add_effect(self, effect):
+        return self.registry.create(effect=effect)
 
     def handle_event(self, event):
         if self.winner_scene:
@@ -139,10 +192,13 @@ class LevelScene:
             return
 
         if event.type == py.KEYDOWN:
+            # шум будит врагов, только если удар действительно был
             if event.key == py.K_SPACE:
-                self.players[0].attack(self.enemies + self.players[1:], self.bullets, self.effects)
+                if self.players[0].attack(self.targets, self.bullets, self.add_effect, self.target_index):
+                    self.make_noise(0)
             elif event.key == py.K_RETURN:
-                self.players[1].attack(self.enemies + self.players[:1], self.bullets, self.effects)
+                if self.players[1].attack(self.targets, self.bullets, self.add_effect, self.target_index):
+                    self.make_noise(1)
             elif event.key == py.K_q:
                 self.players[0].switch_weapon(-1)
             elif event.key == py.K_e:
@@ -153,54 +209,60 @@ class LevelScene:
                 self.players[1].switch_weapon(1)
 
             elif event.key == py.K_r:
-                self.players[0].drop_weapon(self.weapons)
+                self.players[0].drop_weapon(self.weapons, self.weapon_index)
             elif event.key == py.K_RCTRL:
-                self.players[1].drop_weapon(self.weapons)
+                self.players[1].drop_weapon(self.weapons, self.weapon_index)
 
     def update(self):
         if self.winner_scene:
             return
 
-        for player in self.players:
-            player.handle_keys()
-            player.pickup_weapon(self.weapons)
-            original_rect = player.rect.copy()
-            player.rect.x += player.dx
-            player.rect.y += player.dy
-
-            corners = [
-                player.rect.topleft,
-                player.rect.topright,
-                player.rect.bottomleft,
-                player.rect.bottomright
-            ]
-
-            if not all(self.is_point_inside_map(x, y) for (x, y) in corners):
-                player.rect = original_rect
-            player.update()
-
-        for enemy in self.enemies:
-            enemy.update(self.players, self.level_data["world_size"], self.map)
-
-        self.bullets.update()
-        for bullet in self.bullets:
-            if hasattr(bullet, "check_collision"):
-                bullet.check_collision(self.enemies + self.players)
-
-        for eff in self.effects[:]:
-            eff.update(self.enemies + self.players)
-            if getattr(eff, "state", None) == "finished":
-                self.effects.remove(eff)
-
-        self.enemies = [e for e in self.enemies if e.health > 0]
+        profiler = FrameProfiler.get_instance()
+        with profiler.phase("update.players"):
+            for player in self.players:
+                player.previous_center = player.rect.center
+                player.handle_keys()
+                player.pickup_weapon(self.weapons, self.weapon_index)
+                player.rect, player.contact_normal = move_rect(self.map, player.rect, player.dx, player.dy)
+                player.update()
+                self.target_index.update(player)
+
+        with profiler.phase("update.enemies"):
+            self.navigation.update(self.players)
+            scheduled, step_scale = self.ai_scheduler.schedule(self.enemies, self.players,
+                                                                GameClock.get_instance().get_ticks())
+            self.enemies.update(self.players, self.map, self.line_of_sight, self.navigation, scheduled, step_scale)
+            for enemy in self.enemies.take_moved():
+                self.target_index.update(enemy)
+
+        with profiler.phase("update.projectiles"):
+            self.bullets.update()
+            self.projectile_index.sync(self.bullets)
+            for bullet in self.bullets:
+                if hasattr(bullet, "check_collision"):
+                    bullet.check_collision(self.target_index.query_rect(bullet.rect))
+
+        with profiler.phase("update.effects"):
+            for entity_id, eff in self.effects.items():
+                eff.update(self.target_index.query_radius(eff.position, eff.radius))
+                if eff.state == "finished":
+                    self.registry.destroy(entity_id)
+
+        for enemy in self.enemies.remove_dead():
+            self.target_index.remove(enemy)
+            self.registry.destroy(enemy.entity_id)
+        self.registry.flush()
         alive_players = [p for p in self.players if p.health > 0]
         if len(alive_players) == 1 and not self.finished:
             self.finished = True
             for i, player in enumerate(self.players):
                 if player.health <= 0:
+                    winner_index = 1 - i
+                    self.winner_index = winner_index
+                    if self.headless:
+                        return
                     from scene_manager import SceneManager
                     from src.scenes.final_screen import WinScene
-                    winner_index = 1 - i
                     SceneManager.get_instance().add("win", WinScene(winner_index, level_scene_name=self.level_id))
                     SceneManager.get_instance().set_scene("win")
                     return
@@ -215,49 +277,62 @@ class LevelScene:
         screen_w, screen_h = self.window_size
         half_width = screen_w // 2
         world_w, world_h = self.level_data["world_size"]
+        view_size = (half_width, screen_h)
+        if self.view_surfaces is None or self.view_surfaces[0].get_size() != view_size:
+            self.view_surfaces = [py.Surface(view_size), py.Surface(view_size)]
 
         views = [(0, self.players[0]), (half_width, self.players[1])]
+        profiler = FrameProfiler.get_instance()
 
-        for x_offset, player in views:
-            camera_offset = self.get_camera_offset(player.rect, (half_width, screen_h), (world_w, world_h))
-
-            view_surface = py.Surface((half_width, screen_h))
-            view_surface.fill(self.level_data.get("background_color", (40, 40, 40)))
+        for view_surface, (x_offset, player) in zip(self.view_surfaces, views):
+            camera_offset = self.get_camera_offset(player.render_rect(self.render_alpha), view_size, (world_w, world_h))
 
-            self.map.draw(view_surface, -camera_offset)
+            with profiler.phase("render.map"):
+                view_surface.fill(self.level_data.get("background_color", (40, 40, 40)))
+                self.map.draw(view_surface, -camera_offset)
 
-            for weapon in self.weapons:
-                pos = py.Vector2(weapon.rect.topleft) - camera_offset
-                weapon.draw_on_map(view_surface, pos=pos)
-
-            for bullet in self.bullets:
-                pos = py.Vector2(bullet.rect.topleft) - camera_offset
-                view_surface.blit(bullet.image, pos)
-
-            for enemy in self.enemies:
-                enemy.draw(view_surface, camera_offset)
-
-            for eff in self.effects:
-                if hasattr(eff, "draw"):
-                    if isinstance(eff, MolotovEffect):
-                        eff.draw(view_surface, lambda p: (p[0] - camera_offset.x, p[1] - camera_offset.y))
-                    else:
-                        eff.draw(view_surface)
-
-            for p in self.players:
-                if p.health > 0:
-                    original_rect = p.rect.copy()
-                    p.rect = p.rect.move(-camera_offset.x, -camera_offset.y)
-                    p.draw(view_surface)
-                    p.rect = original_rect
+            with profiler.phase("render.entities"):
+                self.queue_visible(py.Rect(camera_offset, view_size))
+                self.render_queue.submit(view_surface, camera_offset)
 
             screen.blit(view_surface, (x_offset, 0))
         py.draw.line(screen, (255, 255, 255), (half_width, 0), (half_width, screen_h), 2)
 
+    def queue_visible(self, camera_rect):
+        # в очередь попадает только то, что видно камере; запас под подписи над спрайтами
+        queue = self.render_queue
+        queue.clear()
+        alpha = self.render_alpha
+        visible_rect = camera_rect.inflate(2 * RENDER_MARGIN, 2 * RENDER_MARGIN)
+
+        for weapon in self.weapon_index.query_rect(visible_rect):
+            queue.add("weapons", weapon.image, weapon.rect.topleft)
+
+        for bullet in self.projectile_index.query_rect(visible_rect):
+            if bullet.alive():
+                center = interpolate(bullet.previous_center, bullet.rect.center, alpha)
+                queue.add("projectiles", bullet.image, bullet.image.get_rect(center=center).topleft)
+
+        enemies = self.registry.store("enemy")
+        for target in self.target_index.query_rect(visible_rect):
+            if target.entity_id in enemies:
+                target.queue_draw(queue, alpha)
+
+        for eff in self.effects:
+            area = py.Rect(0, 0, eff.radius * 2, eff.radius * 2)
+            area.center = eff.position
+            if visible_rect.colliderect(area):
+                eff.queue_draw(queue)
+
+        for p in self.players:
+            if p.health > 0 and visible_rect.colliderect(p.rect):
+                p.queue_draw(queue, alpha)
+
     def restart_level(self):
         self.set_player_choices(self.players[0].gender, self.players[1].gender)
         self.finished = False
         self.winner_scene = None
+        self.winner_index = None
 
     def go_to_main_menu(self):
         from scene_manager import SceneManager
@@ -1,25 +1,20 @@
 import pygame
 import sys
 from audio_manager import AudioManager
-pygame.init()
+from font_manager import FontManager
 
-clock = pygame.time.Clock()
-WIDTH, HEIGHT = 1600, 900
 BUTTON_COLOR = (108, 45, 45)
 BUTTON_HOVER_COLOR = (130, 52, 52)
 TEXT_COLOR = (0, 0, 0)
-FONT = pygame.font.SysFont("Comic Sans MS", 48)
 
 # background_image = pygame.transform.scale(pygame.image.load(" "), (WIDTH, HEIGHT)) # После выбора картинки для заставки
 
-window = pygame.display.set_mode((WIDTH, HEIGHT))
-
 class Button:
     def __init__(self, text, pos, size):
         self.text = text
         self.size = size
         self.color = BUTTON_COLOR
-        self.text_surf = FONT.render(text, True, TEXT_COLOR)
+        self.text_surf = FontManager.get_instance().render(text, 48, TEXT_COLOR, "Comic Sans MS")
         self.set_position(pos)
 
     def set_position(self, pos):
@@ -45,6 +40,7 @@ class MainMenuScene:
         self.next_scene = next_scene
         self.play_button = None
         self.exit_button = None
+        self.last_hovered = None
         self.window_size = (1600, 900)
 
     def on_enter(self):
@@ -72,9 +68,14 @@ class MainMenuScene:
         for button in [self.play_button, self.exit_button]:
             if button.is_hovered(mouse_pos):
                 button.color = BUTTON_HOVER_COLOR
-                self.last_hovered = button
+                # кнопки пересоздаются при каждом update_layout, поэтому сравниваем по надписи
+                if self.last_hovered != button.text:
+                    AudioManager.get_instance().play_sound("hover")
+                self.last_hovered = button.text
             else:
                 button.color = BUTTON_COLOR
+                if self.last_hovered == button.text:
+                    self.last_hovered = None
 
     def render(self, screen):
         screen.fill((30, 30, 30))
@@ -0,0 +1,34 @@
+import time
+
+
+class StartupTimer:
+    _instance = None
+
+    def __init__(self):
+        # отметки холодного старта в мс от создания таймера (первая строка main.py)
+        self.start = time.perf_counter()
+        self.marks = {}
+        self.reported = False
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = StartupTimer()
+        return cls._instance
+
+    def mark(self, name):
+        # считается только первое наступление события; можно звать из фонового потока
+        if name not in self.marks:
+            self.marks[name] = (time.perf_counter() - self.start) * 1000
+
+    def has(self, *names):
+        return all(name in self.marks for name in names)
+
+    def report(self):
+        self.reported = True
+        lines = [f"{'запуск':<14}{'мс':>9}{'+мс':>9}"]
+        previous = 0.0
+        for name, ms in sorted(self.marks.items(), key=lambda item: item[1]):
+            lines.append(f"{name:<14}{ms:9.1f}{ms - previous:9.1f}")
+            previous = ms
+        return lines